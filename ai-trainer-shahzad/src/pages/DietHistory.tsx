@@ -7,7 +7,7 @@ interface Diet {
   name: string;
   fitness_goal: string;
   diet_preference: string;
-  diet_plan: string;
+  diet_plan?: string; // list uses view=summary; loaded on select
   created_at: string;
 }
 
@@ -25,6 +25,7 @@ export default function DietHistory() {
         const token = localStorage.getItem("token");
 
         const res = await axios.get("http://127.0.0.1:8000/diets", {
+          params: { view: "summary" },
           headers: {
             Authorization: `Bearer ${token}`,
           },
@@ -41,6 +42,31 @@ export default function DietHistory() {
     fetchDiets();
   }, []);
 
+  /* ================= LOAD FULL PLAN ON SELECT ================= */
+  const openDiet = async (diet: Diet) => {
+    setSelectedDiet(diet);
+    if (diet.diet_plan !== undefined) return;
+
+    try {
+      const token = localStorage.getItem("token");
+
+      const res = await axios.get(`http://127.0.0.1:8000/diets/${diet.id}`, {
+        headers: {
+          Authorization: `Bearer ${token}`,
+        },
+      });
+
+      setDiets((prev) =>
+        prev.map((d) => (d.id === diet.id ? res.data : d))
+      );
+      setSelectedDiet((current) =>
+        current?.id === diet.id ? res.data : current
+      );
+    } catch {
+      alert("Failed to load diet plan");
+    }
+  };
+
   /* ================= SELECTION LOGIC ================= */
   const toggleSelect = (id: number) => {
     setSelectedIds((prev) =>
@@ -123,7 +149,7 @@ export default function DietHistory() {
               className={`history-item ${
                 selectedDiet?.id === diet.id ? "active" : ""
               }`}
-              onClick={() => setSelectedDiet(diet)}
+              onClick={() => openDiet(diet)}
             >
               <input
                 type="checkbox"
@@ -150,7 +176,7 @@ export default function DietHistory() {
         {/* ================= RIGHT DETAIL ================= */}
         <div className="history-detail">
           {selectedDiet ? (
-            <pre>{selectedDiet.diet_plan}</pre>
+            <pre>{selectedDiet.diet_plan ?? "Loading..."}</pre>
           ) : (
             <p>Select a diet to view details</p>
           )}
@@ -69,7 +69,7 @@ export default function WorkoutTips() {
   // =========================
   // GENERATE AI TIPS
   // =========================
-  const handleGenerateTips = async () => {
+  const handleGenerateTips = async (regenerate: boolean = false) => {
     try {
       setLoading(true);
       setError("");
@@ -86,6 +86,7 @@ export default function WorkoutTips() {
 
       const res = await axios.get("/workout-tips", {
         headers: { Authorization: `Bearer ${token}` },
+        params: regenerate ? { regenerate: true } : undefined,
       });
 
       setTipsBySection({
@@ -117,7 +118,7 @@ export default function WorkoutTips() {
     setDisplayedTips([]);
     setIsTyping(false);
     setSaved(false);
-    handleGenerateTips();
+    handleGenerateTips(true);
   };
 
   // =========================
@@ -329,7 +330,7 @@ export default function WorkoutTips() {
 
           {/* ACTION BAR */}
           <div className="ai-actions three">
-            <button className="ai-btn" onClick={handleGenerateTips}>
+            <button className="ai-btn" onClick={() => handleGenerateTips()}>
               🚀 Generate Tips
             </button>
 
@@ -25,9 +25,13 @@ sys.path.append(BASE_DIR)
 # --------------------------------------------------
 # IMPORT SQLALCHEMY METADATA
 # --------------------------------------------------
-from database import Base
+from database import Base, DATABASE_URL
 import models  # noqa: F401 (needed so Alembic sees models)
 
+# Same DSN as the app (DATABASE_URL env); % must be escaped for configparser
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 # Tell Alembic where metadata is
 target_metadata = Base.metadata
 
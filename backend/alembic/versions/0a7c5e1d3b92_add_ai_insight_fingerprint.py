@@ -0,0 +1,35 @@
+"""add ai_insights fingerprint
+
+Revision ID: 0a7c5e1d3b92
+Revises: f2b8c4e9a630
+Create Date: 2026-10-18 12:37:09.415883
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7c5e1d3b92'
+down_revision: Union[str, Sequence[str], None] = 'f2b8c4e9a630'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Memoize insights by input fingerprint instead of
+    inserting a row on every GET /workouts/insights.
+    """
+    op.add_column('ai_insights', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.create_index('ix_ai_insights_user_id_source', 'ai_insights', ['user_id', 'source'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Remove ai_insights fingerprint.
+    """
+    op.drop_index('ix_ai_insights_user_id_source', table_name='ai_insights')
+    op.drop_column('ai_insights', 'fingerprint')
@@ -0,0 +1,132 @@
+"""base schema
+
+Revision ID: 0f4a2b6c8d15
+Revises:
+Create Date: 2026-10-18 15:02:37.514920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f4a2b6c8d15'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Tables as they existed before 1350a1eb72bd (initial_schema),
+    which only alters them — so `alembic upgrade head` works on an
+    empty database. Databases already stamped at any later revision
+    treat this one as applied and never run it.
+    """
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # MySQL's name for the original UNIQUE(email); initial_schema drops it
+    op.create_index('email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'workouts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('age', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Integer(), nullable=True),
+        sa.Column('weight_unit', sa.String(length=10), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('height_unit', sa.String(length=10), nullable=True),
+        sa.Column('blood_group', sa.String(length=5), nullable=True),
+        sa.Column('fitness_goal', sa.String(length=50), nullable=True),
+        sa.Column('medical_condition', sa.String(length=50), nullable=True),
+        sa.Column('workout_preference', sa.String(length=50), nullable=True),
+        sa.Column('workout_plan', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workouts_id'), 'workouts', ['id'], unique=False)
+
+    op.create_table(
+        'normalized_exercises',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('sets', sa.Integer(), nullable=True),
+        sa.Column('reps', sa.String(length=50), nullable=True),
+        sa.Column('rest', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_normalized_exercises_id'), 'normalized_exercises', ['id'], unique=False)
+
+    op.create_table(
+        'diets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('age', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Integer(), nullable=True),
+        sa.Column('weight_unit', sa.String(length=10), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('height_unit', sa.String(length=10), nullable=True),
+        sa.Column('blood_group', sa.String(length=5), nullable=True),
+        sa.Column('fitness_goal', sa.String(length=50), nullable=True),
+        sa.Column('medical_condition', sa.String(length=50), nullable=True),
+        sa.Column('diet_preference', sa.String(length=50), nullable=True),
+        sa.Column('diet_plan', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_table(
+        'workout_tip_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=True),
+        sa.Column('tips', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workout_tip_history_id'), 'workout_tip_history', ['id'], unique=False)
+
+    op.create_table(
+        'ai_insights',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=True),
+        sa.Column('insights', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_ai_insights_id'), 'ai_insights', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Drop the base tables.
+    """
+    op.drop_index(op.f('ix_ai_insights_id'), table_name='ai_insights')
+    op.drop_table('ai_insights')
+    op.drop_index(op.f('ix_workout_tip_history_id'), table_name='workout_tip_history')
+    op.drop_table('workout_tip_history')
+    op.drop_table('diets')
+    op.drop_index(op.f('ix_normalized_exercises_id'), table_name='normalized_exercises')
+    op.drop_table('normalized_exercises')
+    op.drop_index(op.f('ix_workouts_id'), table_name='workouts')
+    op.drop_table('workouts')
+    op.drop_index('email', table_name='users')
+    op.drop_table('users')
@@ -1,7 +1,7 @@
 """initial_schema
 
 Revision ID: 1350a1eb72bd
-Revises: 
+Revises: 0f4a2b6c8d15
 Create Date: 2025-12-26 19:20:44.453690
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '1350a1eb72bd'
-down_revision: Union[str, Sequence[str], None] = None
+down_revision: Union[str, Sequence[str], None] = '0f4a2b6c8d15'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -39,7 +39,8 @@ def upgrade() -> None:
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(None, 'users', type_='unique')
+    # MySQL named the unnamed UNIQUE(username) after its column
+    op.drop_constraint('username', 'users', type_='unique')
     op.drop_index(op.f('ix_users_id'), table_name='users')
     op.drop_index(op.f('ix_users_email'), table_name='users')
     op.create_index(op.f('email'), 'users', ['email'], unique=True)
@@ -0,0 +1,51 @@
+"""add workout tips cache
+
+Revision ID: b81f3c2d9e10
+Revises: a732e0547642
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f3c2d9e10'
+down_revision: Union[str, Sequence[str], None] = 'a732e0547642'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Content-addressed cache for generated workout tips.
+    Keyed by sha256(prompt_version, model, workout_plan).
+    """
+    op.create_table(
+        'workout_tips_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=50), nullable=False),
+        sa.Column('prompt_version', sa.String(length=20), nullable=False),
+        sa.Column('tips', sa.JSON(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workout_tips_cache_id'), 'workout_tips_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_workout_tips_cache_cache_key'), 'workout_tips_cache', ['cache_key'], unique=True)
+
+
+def downgrade() -> None:
+    """
+    Drop workout tips cache table.
+    """
+    op.drop_index(op.f('ix_workout_tips_cache_cache_key'), table_name='workout_tips_cache')
+    op.drop_index(op.f('ix_workout_tips_cache_id'), table_name='workout_tips_cache')
+    op.drop_table('workout_tips_cache')
@@ -0,0 +1,34 @@
+"""add user_id, created_at indexes
+
+Revision ID: c4d2e7a1f083
+Revises: b81f3c2d9e10
+Create Date: 2026-10-18 10:02:17.530911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e7a1f083'
+down_revision: Union[str, Sequence[str], None] = 'b81f3c2d9e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Composite indexes backing keyset pagination of
+    /workouts/memory and /diets.
+    """
+    op.create_index('ix_workouts_user_id_created_at', 'workouts', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_diets_user_id_created_at', 'diets', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Drop keyset pagination indexes.
+    """
+    op.drop_index('ix_diets_user_id_created_at', table_name='diets')
+    op.drop_index('ix_workouts_user_id_created_at', table_name='workouts')
@@ -0,0 +1,31 @@
+"""index normalized_exercises.workout_id
+
+Revision ID: d9a5b3c8e214
+Revises: c4d2e7a1f083
+Create Date: 2026-10-18 10:41:05.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a5b3c8e214'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e7a1f083'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Exercises are now loaded per workout on every read.
+    """
+    op.create_index(op.f('ix_normalized_exercises_workout_id'), 'normalized_exercises', ['workout_id'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Drop normalized_exercises.workout_id index.
+    """
+    op.drop_index(op.f('ix_normalized_exercises_workout_id'), table_name='normalized_exercises')
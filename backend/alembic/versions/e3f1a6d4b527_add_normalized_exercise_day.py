@@ -0,0 +1,32 @@
+"""add normalized_exercises.day
+
+Revision ID: e3f1a6d4b527
+Revises: d9a5b3c8e214
+Create Date: 2026-10-18 11:20:48.664102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f1a6d4b527'
+down_revision: Union[str, Sequence[str], None] = 'd9a5b3c8e214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Day grouping from the structured plan parser.
+    """
+    op.add_column('normalized_exercises', sa.Column('day', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """
+    Remove normalized_exercises.day.
+    """
+    op.drop_column('normalized_exercises', 'day')
@@ -0,0 +1,48 @@
+"""add user exercise stats
+
+Revision ID: f2b8c4e9a630
+Revises: e3f1a6d4b527
+Create Date: 2026-10-18 11:58:32.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c4e9a630'
+down_revision: Union[str, Sequence[str], None] = 'e3f1a6d4b527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Per-user, per-day exercise counts for windowed insights.
+    Populate existing data with backfill_normalized_exercises.py.
+    """
+    op.create_table(
+        'user_exercise_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_name', sa.String(length=255), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'exercise_name', 'day', name='uq_user_exercise_stats_user_name_day'),
+    )
+    op.create_index(op.f('ix_user_exercise_stats_id'), 'user_exercise_stats', ['id'], unique=False)
+    op.create_index('ix_user_exercise_stats_user_id_day', 'user_exercise_stats', ['user_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """
+    Drop user exercise stats.
+    """
+    op.drop_index('ix_user_exercise_stats_user_id_day', table_name='user_exercise_stats')
+    op.drop_index(op.f('ix_user_exercise_stats_id'), table_name='user_exercise_stats')
+    op.drop_table('user_exercise_stats')
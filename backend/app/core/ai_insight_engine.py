@@ -1,5 +1,5 @@
 from collections import Counter
-from typing import List, Dict
+from typing import List, Dict, Mapping
 
 
 def generate_ai_insights(
@@ -16,15 +16,6 @@ def generate_ai_insights(
     Structured AI coaching insights (stable + DB-safe)
     """
 
-    if not normalized_workouts:
-        return {
-            "coach": "Aria",
-            "title": "AI Training Insight",
-            "warmup": ["Log more workouts to unlock personalized insights."],
-            "workout": [],
-            "recovery": [],
-        }
-
     # =========================
     # FLATTEN EXERCISES
     # =========================
@@ -36,7 +27,25 @@ def generate_ai_insights(
             if name:
                 all_exercises.append(name.lower())
 
-    frequency = Counter(all_exercises)
+    return generate_ai_insights_from_counts(Counter(all_exercises))
+
+
+def generate_ai_insights_from_counts(
+    frequency: Mapping[str, int]
+) -> Dict:
+    """
+    Same insights, from pre-aggregated {exercise name: count}
+    (e.g. user_exercise_stats over a 7/30/90 day window).
+    """
+
+    if not frequency:
+        return {
+            "coach": "Aria",
+            "title": "AI Training Insight",
+            "warmup": ["Log more workouts to unlock personalized insights."],
+            "workout": [],
+            "recovery": [],
+        }
 
     # =========================
     # INSIGHT BUCKETS
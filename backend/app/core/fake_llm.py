@@ -0,0 +1,43 @@
+import asyncio
+import re
+from typing import AsyncIterator, Dict, List
+
+# ======================================================
+# 🧪 FAKE STREAMING LLM (OFFLINE DEV / TESTS)
+# ======================================================
+# Enabled with AI_FAKE_LLM=1 — see openai_service.astream_completion.
+# Emits a canned plan token-by-token, the same shape as
+# OpenAI's streamed `choices[0].delta.content` chunks.
+
+FAKE_PLAN = """Day 1 - Upper Body
+Warm-up: 5 minutes light cardio
+Push-ups: 3 sets x 10-12 reps, rest 60 sec
+Dumbbell Rows: 3 sets x 12 reps, rest 60 sec
+Shoulder Press: 3 sets x 10 reps, rest 90 sec
+
+Day 2 - Lower Body
+Bodyweight Squats: 3 sets x 15 reps, rest 60 sec
+Lunges: 3 sets x 10 reps each leg, rest 60 sec
+Glute Bridges: 3 sets x 15 reps, rest 45 sec
+
+Day 3 - Full Body
+Plank: 3 sets x 30 sec, rest 30 sec
+Burpees: 3 sets x 8 reps, rest 90 sec
+
+Cool-down: stretch for 5-10 minutes after every session."""
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+async def fake_stream_completion(
+    messages: List[Dict[str, str]],
+    text: str = FAKE_PLAN,
+    delay: float = 0.01,
+) -> AsyncIterator[str]:
+    """
+    Yield `text` in word-sized chunks with a small delay,
+    ignoring the messages.
+    """
+    for match in _TOKEN_RE.finditer(text):
+        yield match.group(0)
+        await asyncio.sleep(delay)
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# ======================================================
+# 🧵 BACKGROUND JOB QUEUE (LLM GENERATIONS)
+# ======================================================
+# Bounded asyncio queue + fixed worker pool.
+# Job state lives in a pluggable store so status survives
+# the worker that ran it:
+#   JOB_STORE=memory  (default, per process)
+#   JOB_STORE=sqlite  (JOB_STORE_PATH, shared by local workers)
+# Workers are started/stopped by the app lifespan; jobs still
+# queued or running at shutdown are marked failed. Finished jobs
+# are kept for JOB_TTL seconds (memory store: at most JOB_MAX_KEPT).
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JOB_TTL = float(os.getenv("JOB_TTL", 3600))
+JOB_MAX_KEPT = int(os.getenv("JOB_MAX_KEPT", 10000))
+
+SHUTDOWN_ERROR = "Server shut down before the job finished"
+
+
+class QueueFull(Exception):
+    """Raised when the queue is at capacity (caller should 503)."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# =========================
+# STORES
+# =========================
+class MemoryJobStore:
+    def __init__(self, ttl: float = JOB_TTL, max_kept: int = JOB_MAX_KEPT):
+        self.ttl = ttl
+        self.max_kept = max_kept
+
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # job id → monotonic finish time, oldest first
+        self._finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self) -> None:
+        # Only finished jobs go; queued/running ones are bounded
+        # by the queue size and worker count
+        expired_before = time.monotonic() - self.ttl
+        for job_id, finished in list(self._finished.items()):
+            if finished > expired_before and len(self._jobs) < self.max_kept:
+                break
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._evict()
+            self._jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+                if fields.get("status") in (SUCCEEDED, FAILED):
+                    self._finished[job_id] = time.monotonic()
+
+
+class SQLiteJobStore:
+    """
+    Local durable store — a stand-in for Redis when several
+    workers on one host need to see each other's jobs.
+    """
+
+    _COLUMNS = (
+        "id", "kind", "user_id", "status",
+        "result", "error", "created_at", "finished_at",
+    )
+
+    def __init__(self, path: str, ttl: float = JOB_TTL):
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    user_id INTEGER,
+                    status TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT,
+                    finished_at TEXT
+                )
+                """
+            )
+
+    def create(self, job: Dict[str, Any]) -> None:
+        row = dict(job, result=json.dumps(job.get("result")))
+        # ISO-8601 UTC strings compare in time order
+        expired_before = (
+            datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+        ).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at < ?", (expired_before,)
+            )
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self._COLUMNS)})",
+                [row.get(c) for c in self._COLUMNS],
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(zip(self._COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                [*fields.values(), job_id],
+            )
+
+
+def store_from_env():
+    if os.getenv("JOB_STORE", "memory") == "sqlite":
+        return SQLiteJobStore(os.getenv("JOB_STORE_PATH", "jobs.sqlite3"))
+    return MemoryJobStore()
+
+
+# =========================
+# QUEUE
+# =========================
+class JobQueue:
+    def __init__(self, store, workers: int = 4, maxsize: int = 100):
+        self.store = store
+        self.workers = workers
+        self.maxsize = maxsize
+        self.running = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def start(self) -> None:
+        """
+        Create the queue and workers on the running (serving) loop.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._tasks = [
+                asyncio.create_task(self._worker(self._queue))
+                for _ in range(self.workers)
+            ]
+
+    async def stop(self) -> None:
+        """
+        Cancel the workers; running and still-queued jobs are failed.
+        """
+        queue, self._queue = self._queue, None
+        tasks, self._tasks = self._tasks, []
+        if queue is None:
+            return
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        while not queue.empty():
+            job_id, _ = queue.get_nowait()
+            self._fail(job_id, SHUTDOWN_ERROR)
+
+    def _fail(self, job_id: str, error: str) -> None:
+        self.store.update(
+            job_id,
+            status=FAILED,
+            error=error,
+            finished_at=_now(),
+        )
+
+    def submit(
+        self,
+        kind: str,
+        user_id: int,
+        fn: Callable[[], Awaitable[Any]],
+    ) -> Dict[str, Any]:
+        """
+        Enqueue `fn` and return the new job record.
+        Must be called from the event loop.
+        """
+        if self._queue is None:
+            raise QueueFull("Job queue is not running")
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "user_id": user_id,
+            "status": QUEUED,
+            "result": None,
+            "error": None,
+            "created_at": _now(),
+            "finished_at": None,
+        }
+
+        if self._queue.full():
+            raise QueueFull(f"Job queue is full ({self.maxsize})")
+
+        self.store.create(job)
+        self._queue.put_nowait((job["id"], fn))
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "running": self.running,
+        }
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            job_id, fn = await queue.get()
+            self.running += 1
+            self.store.update(job_id, status=RUNNING)
+
+            try:
+                result = await fn()
+                self.store.update(
+                    job_id,
+                    status=SUCCEEDED,
+                    result=result,
+                    finished_at=_now(),
+                )
+            except asyncio.CancelledError:
+                self._fail(job_id, SHUTDOWN_ERROR)
+                raise
+            except Exception as e:
+                self._fail(job_id, str(e))
+            finally:
+                self.running -= 1
+                queue.task_done()
@@ -0,0 +1,36 @@
+import json
+import re
+from typing import Any
+
+# ======================================================
+# 🧩 TOLERANT JSON EXTRACTION FROM LLM OUTPUT
+# ======================================================
+# Fallback for responses that were not produced in structured
+# output mode: ```json fences, a sentence before/after the object.
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def extract_json_object(text: str) -> Any:
+    """
+    Parse `text` as JSON, else the first fenced block, else the
+    outermost {...} span. Raises ValueError if none parse.
+    """
+    text = (text or "").strip()
+    candidates = [text]
+
+    fence = _FENCE_RE.search(text)
+    if fence:
+        candidates.append(fence.group(1).strip())
+
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+
+    raise ValueError("No JSON object found in LLM output")
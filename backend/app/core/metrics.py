@@ -0,0 +1,304 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ======================================================
+# 📈 PROMETHEUS METRICS
+# ======================================================
+# One module owns every metric so names and labels stay
+# consistent. Request latency is per route template (never the
+# raw path); `stage` histograms split a request into auth, DB,
+# OpenAI, parsing and SMTP time.
+#
+# Multi-worker (gunicorn): set PROMETHEUS_MULTIPROC_DIR and
+# /metrics aggregates every worker's files.
+
+_FAST_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+_SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+_HTTP_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+    buckets=_HTTP_BUCKETS,
+)
+
+STAGE_SECONDS = Histogram(
+    "request_stage_duration_seconds",
+    "Time spent in one stage of a request (auth, parse, ...).",
+    ("stage",),
+    buckets=_FAST_BUCKETS,
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Upstream OpenAI call latency (one sample per attempt).",
+    ("model", "outcome"),
+    buckets=_SLOW_BUCKETS,
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by response.usage.",
+    ("model", "kind", "endpoint"),
+)
+
+CACHED_PROMPT_RATIO = Histogram(
+    "llm_cached_prompt_ratio",
+    "Per call: share of prompt tokens served from the provider's prompt cache.",
+    ("model", "endpoint"),
+    buckets=(0.0, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time.",
+    ("operation",),
+    buckets=_FAST_BUCKETS,
+)
+
+SMTP_SECONDS = Histogram(
+    "smtp_duration_seconds",
+    "SMTP connect (incl. STARTTLS + AUTH) and send time.",
+    ("step", "outcome"),
+    buckets=_SLOW_BUCKETS,
+)
+
+PARSE_FAILURES = Counter(
+    "llm_parse_failures_total",
+    "LLM responses that could not be parsed.",
+    ("kind",),
+)
+
+# Failure rate = llm_parse_failures_total / llm_parses_total
+PARSES = Counter(
+    "llm_parses_total",
+    "LLM responses parsed, by path (json, extracted, failed).",
+    ("kind", "result"),
+)
+
+# outcome: retried (cap raised once) | failed (still cut off)
+LLM_TRUNCATIONS = Counter(
+    "llm_truncations_total",
+    "Completions cut off at max_tokens (finish_reason=length).",
+    ("model", "endpoint", "outcome"),
+)
+
+BACKGROUND_FAILURES = Counter(
+    "background_task_failures_total",
+    "Unexpected errors in background workers (email_outbox, tips_prefetch).",
+    ("task",),
+)
+
+# =========================
+# ROUTE CONTEXT
+# =========================
+# The ASGI scope of the current request; read lazily because the
+# route is only known after routing. Background work sets a
+# plain label instead (see `endpoint_label`).
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    "metrics_endpoint", default=None
+)
+
+
+def _route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_endpoint() -> str:
+    current = _current.get()
+    if current is None:
+        return "none"
+    if isinstance(current, str):
+        return current
+    return _route_of(current)
+
+
+@contextmanager
+def endpoint_label(label: str) -> Iterator[None]:
+    """
+    Attribute LLM tokens etc. to `label` (e.g. "job:workout").
+    """
+    token = _current.set(label)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def record_llm_usage(model: str, usage) -> None:
+    if usage is None:
+        return
+
+    endpoint = current_endpoint()
+    LLM_TOKENS.labels(model, "prompt", endpoint).inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(model, "completion", endpoint).inc(usage.completion_tokens or 0)
+
+    # Prompt tokens served from OpenAI's prefix cache (subset of "prompt")
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    LLM_TOKENS.labels(model, "cached_prompt", endpoint).inc(cached)
+    CACHED_PROMPT_RATIO.labels(model, endpoint).observe(
+        cached / usage.prompt_tokens if usage.prompt_tokens else 0.0
+    )
+
+
+def record_truncation(model: str, outcome: str) -> None:
+    LLM_TRUNCATIONS.labels(model, current_endpoint(), outcome).inc()
+
+
+# =========================
+# HTTP MIDDLEWARE (PURE ASGI)
+# =========================
+class MetricsMiddleware:
+    """
+    Observes latency per (method, route template, status).
+    Pure ASGI, so streaming responses are timed to the last byte
+    without being buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = _current.set(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = _route_of(scope)
+            if route != "/metrics":
+                HTTP_REQUEST_SECONDS.labels(
+                    scope["method"], route, str(status["code"])
+                ).observe(time.perf_counter() - start)
+
+
+# =========================
+# DB (SQLALCHEMY EVENTS)
+# =========================
+def _operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if starts:
+        DB_QUERY_SECONDS.labels(_operation(statement)).observe(
+            time.perf_counter() - starts.pop()
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_query_start"):
+        conn.info["metrics_query_start"].pop()
+
+
+# =========================
+# IN-PROCESS STATS AS GAUGES
+# =========================
+# The JSON /…/stats endpoints, exported as
+# app_<name>_<key> gauges (nested dicts are flattened).
+_stats_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register_stats(name: str, source: Callable[[], dict]) -> None:
+    _stats_sources[name] = source
+
+
+def _flatten(prefix: str, data: dict) -> Iterator:
+    for key, value in data.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+class _StatsCollector:
+    def collect(self):
+        for source_name, source in list(_stats_sources.items()):
+            try:
+                data = source()
+            except Exception:
+                continue
+
+            for name, value in _flatten(f"app_{source_name}", data):
+                gauge = GaugeMetricFamily(name, f"{source_name} stats")
+                gauge.add_metric([], value)
+                yield gauge
+
+
+_stats_collector = _StatsCollector()
+REGISTRY.register(_stats_collector)
+
+
+def render_latest() -> tuple:
+    """
+    (body, content type) for GET /metrics.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_stats_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def observe_llm(model: str, outcome: str, seconds: float) -> None:
+    LLM_REQUEST_SECONDS.labels(model, outcome).observe(seconds)
+
+
+def observe_smtp(step: str, outcome: str, seconds: float) -> None:
+    SMTP_SECONDS.labels(step, outcome).observe(seconds)
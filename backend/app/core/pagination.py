@@ -0,0 +1,102 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from app.core.responses import ORJSONResponse
+
+# ======================================================
+# 📄 KEYSET PAGINATION ON (created_at, id)
+# ======================================================
+# Newest first. The cursor is an opaque token of the last
+# row's (created_at, id); the next page is every row strictly
+# "older" than it, so no OFFSET scan is ever needed.
+#
+# The comparison runs against the cursor row's *stored*
+# created_at (looked up by id), not the decoded timestamp: a
+# bound datetime does not compare equal to what every backend
+# stored (SQLite keeps 'YYYY-MM-DD HH:MM:SS' text and binds
+# '... .000000'), which repeated ties across pages. The decoded
+# value is only the fallback when the cursor row is gone.
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def apply_keyset(stmt, model, limit: int, cursor: Optional[str] = None):
+    """
+    Add the keyset filter, ordering and limit (+1 probe row) to a
+    Query or 2.0-style select(); pair with `split_page`.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        anchor = func.coalesce(
+            select(model.created_at)
+            .where(model.id == row_id)
+            .scalar_subquery(),
+            created_at,
+        )
+        stmt = stmt.filter(
+            or_(
+                model.created_at < anchor,
+                and_(model.created_at == anchor, model.id < row_id),
+            )
+        )
+
+    return (
+        stmt
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def split_page(rows: List, limit: int):
+    """
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def listing_response(items: List, paginated: bool, next_cursor: Optional[str]):
+    """
+    Plain list, or {"items", "next_cursor"} for a keyset page.
+    Items are plain dicts → orjson directly, no jsonable_encoder pass.
+    """
+    if not paginated:
+        return ORJSONResponse(items)
+
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+def keyset_page(query, model, limit: int, cursor: Optional[str] = None):
+    """
+    Apply newest-first keyset pagination to a sync `query`.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = apply_keyset(query, model, limit, cursor).all()
+    return split_page(rows, limit)
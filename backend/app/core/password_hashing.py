@@ -0,0 +1,38 @@
+import os
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# ======================================================
+# 🔐 BCRYPT (PROCESS-POOL SAFE)
+# ======================================================
+# Kept import-light: auth.py runs these functions in a
+# ProcessPoolExecutor, so each worker process imports only
+# this module, not the FastAPI app.
+
+# Cost factor per environment (e.g. 10 in dev, 12+ in prod).
+# Hashes with a different cost are rehashed on next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+)
+
+
+def hash_password(password: str) -> str:
+    """
+    bcrypt max length is 72 chars.
+    """
+    return pwd_context.hash(password[:72])
+
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (valid, new_hash). new_hash is set when the stored
+    hash uses a different cost and should be replaced.
+    """
+    if not hashed:
+        return False, None
+    return pwd_context.verify_and_update(password[:72], hashed)
@@ -0,0 +1,50 @@
+from typing import Dict, List
+
+from app.core.tokens import truncate_to_tokens
+from app.core.workout_normalizer import normalize_workout_plan
+
+# ======================================================
+# ✂️ PROMPT COMPACTION FOR WORKOUT PLANS
+# ======================================================
+# The tips prompt only needs the training structure, not 3-5
+# days of prose. Normalized exercises are rendered one line per
+# day:
+#   Day 1: Push-Up 3x10-12 rest 60 sec; Dumbbell Row 3x12 rest 60 sec
+# Plans the parser cannot read fall back to the raw text; either
+# way the result is capped at `max_tokens`.
+
+
+def _exercise(ex: Dict) -> str:
+    text = ex["name"]
+
+    if ex.get("sets") and ex.get("reps"):
+        text += f" {ex['sets']}x{ex['reps']}"
+    elif ex.get("sets"):
+        text += f" {ex['sets']} sets"
+    elif ex.get("reps"):
+        text += f" {ex['reps']}"
+
+    if ex.get("rest"):
+        text += f" rest {ex['rest']}"
+
+    return text
+
+
+def summarize_exercises(exercises: List[Dict]) -> str:
+    days: Dict = {}
+    for ex in exercises:
+        days.setdefault(ex.get("day"), []).append(_exercise(ex))
+
+    lines = []
+    for day, items in days.items():
+        prefix = f"Day {day}: " if day is not None else ""
+        lines.append(prefix + "; ".join(items))
+
+    return "\n".join(lines)
+
+
+def compact_plan(plan: str, max_tokens: int, model: str) -> str:
+    exercises = normalize_workout_plan(plan)
+    text = summarize_exercises(exercises) if exercises else plan.strip()
+
+    return truncate_to_tokens(text, max_tokens, model)
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+# ======================================================
+# 🧾 VERSIONED PROMPT TEMPLATES
+# ======================================================
+# OpenAI caches the longest previously-seen prompt *prefix*
+# (in 128-token steps once a prompt reaches 1024 tokens).
+# To keep that prefix identical across users, every template is
+# split into:
+# - `system`: static instructions, byte-for-byte the same on
+#   every call — never interpolate anything into it
+# - `user`:   the per-request data, always sent last
+#
+# Bump `version` whenever either part changes. The version is
+# part of the template id, which is used as `prompt_cache_key`
+# and in the tips cache key.
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    version: str
+    system: str
+    user: str
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}:{self.version}"
+
+    def messages(self, **fields) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user.format(**fields)},
+        ]
+
+
+# =========================
+# WORKOUT PLAN
+# =========================
+WORKOUT_PLAN = PromptTemplate(
+    name="workout_plan",
+    version="v2",
+    system="""You are an AI fitness coach. Create a personalized workout plan for the user described in the next message.
+
+Instructions:
+- Create a 3 to 5 day workout plan
+- Include exercise name, sets, and reps
+- Keep it beginner friendly and safe
+- Respect the user's medical condition
+- Add warm-up and cool-down advice
+- Simple, clean text format""",
+    user="""User Information:
+Name: {name}
+Age: {age}
+Weight: {weight} {weight_unit}
+Height: {height} {height_unit}
+Blood Group: {blood_group}
+
+Fitness Goal: {fitness_goal}
+Medical Condition: {medical_condition}
+Workout Preference: {workout_preference}""",
+)
+
+# =========================
+# DIET PLAN
+# =========================
+DIET_PLAN = PromptTemplate(
+    name="diet_plan",
+    version="v2",
+    system="""You are an AI nutrition coach. Create a personalized diet plan for the user described in the next message.
+
+Instructions:
+- Create a 7-day diet plan
+- Include breakfast, lunch, dinner, and snacks
+- Mention portion sizes
+- Add hydration tips
+- Respect the user's medical condition and diet preference
+- Keep it healthy, realistic, and beginner friendly
+- Simple, clean text format""",
+    user="""User Information:
+Name: {name}
+Age: {age}
+Weight: {weight} {weight_unit}
+Height: {height} {height_unit}
+Blood Group: {blood_group}
+
+Fitness Goal: {fitness_goal}
+Medical Condition: {medical_condition}
+Diet Preference: {diet_preference}""",
+)
+
+# =========================
+# WORKOUT TIPS
+# =========================
+WORKOUT_TIPS = PromptTemplate(
+    name="workout_tips",
+    version="v3",
+    system="""You are an AI fitness coach. Generate workout tips for the workout plan summarized in the next message.
+
+The summary lists one training day per line: exercise, sets x reps, rest.
+
+Respond in JSON ONLY.
+
+Rules:
+- Exactly 3 tips for warmup
+- Exactly 3 tips for workout
+- Exactly 3 tips for recovery
+- Each tip must be a short sentence
+- Use simple language
+- No emojis
+- No markdown
+- No headings
+- No extra text
+
+Output format:
+{
+  "warmup": ["...", "...", "..."],
+  "workout": ["...", "...", "..."],
+  "recovery": ["...", "...", "..."]
+}""",
+    user="""Workout plan summary:
+{plan}""",
+)
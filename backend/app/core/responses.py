@@ -0,0 +1,60 @@
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional: gzip only
+    BrotliMiddleware = None
+
+# ======================================================
+# ⚡ RESPONSE ENCODING (ORJSON + COMPRESSION)
+# ======================================================
+# Plan-heavy payloads (/workouts/memory, /diets) are mostly
+# multi-KB plan text, which compresses ~4-6x.
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (datetimes handled natively;
+    the stdlib fallback runs jsonable_encoder first).
+    Handlers that build plain dicts return this directly, which
+    skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            # stdlib json can't encode datetimes — handlers pass raw
+            # created_at values, so encode them the way FastAPI would
+            return super().render(jsonable_encoder(content))
+
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def add_compression(app, minimum_size: int, gzip_level: int = 6) -> None:
+    """
+    Brotli (gzip fallback) when brotli-asgi is installed, else GZip.
+    Bodies under `minimum_size` bytes and SSE streams are sent as-is.
+    """
+    if BrotliMiddleware is not None:
+        app.add_middleware(
+            BrotliMiddleware,
+            minimum_size=minimum_size,
+            gzip_fallback=True,
+            excluded_handlers=[r".*/stream$"],
+        )
+        return
+
+    # text/event-stream is excluded by Starlette itself
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=minimum_size,
+        compresslevel=gzip_level,
+    )
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.cache import content_hash
+
+# ======================================================
+# 🔁 SINGLE-FLIGHT (REQUEST COALESCING)
+# ======================================================
+# Concurrent identical LLM requests share one upstream call.
+# Sync callers (threadpool routes) and async callers (event-loop
+# routes, tips prefetch) share one in-flight table, so a request
+# joins a call started by either kind.
+#
+# Async: the upstream call runs in its own task, so one waiter
+# going away (client disconnect, cancelled prefetch) never fails
+# the others. When the *last* waiter is cancelled nobody can use
+# the result, so the upstream task is cancelled too (frees the
+# LLM concurrency slot instead of finishing a call for no one).
+# An async caller joining a sync leader waits in a worker thread.
+
+
+def llm_key(model: str, temperature: float, prompt: str) -> str:
+    return content_hash(model, repr(temperature), prompt)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+        self.task: Optional["asyncio.Task"] = None  # async leader only
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+        # upstream = calls actually made, coalesced = calls that waited
+        self.upstream = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[_Call, bool]:
+        # Caller holds self._lock
+        call = self._calls.get(key)
+        leader = call is None
+
+        if leader:
+            call = _Call()
+            self._calls[key] = call
+            self.upstream += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        return call, leader
+
+    def _leave(self, call: _Call) -> None:
+        with self._lock:
+            call.waiters -= 1
+
+    def _finish(self, key: str, call: _Call, result=None, error=None) -> None:
+        call.result, call.error = result, error
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.event.set()
+
+    def _settle(self, key: str, call: _Call, task: "asyncio.Task") -> None:
+        if task.cancelled():
+            self._finish(key, call, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, call, error=task.exception())
+        else:
+            self._finish(key, call, result=task.result())
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call, leader = self._join(key)
+
+        try:
+            if not leader:
+                call.event.wait()
+                return call.outcome()
+
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, call, error=e)
+                raise
+            self._finish(key, call, result=result)
+            return result
+        finally:
+            self._leave(call)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call, leader = self._join(key)
+            if leader:
+                call.task = loop.create_task(fn())
+                call.task.add_done_callback(
+                    lambda task: self._settle(key, call, task)
+                )
+
+        try:
+            if call.task is not None and call.task.get_loop() is loop:
+                return await asyncio.shield(call.task)
+
+            # Led by a sync caller (or another loop)
+            await asyncio.to_thread(call.event.wait)
+            return call.outcome()
+        except asyncio.CancelledError:
+            with self._lock:
+                last = call.waiters == 1
+            if last and call.task is not None and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            self._leave(call)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+# Shared by every LLM call site
+llm_singleflight = SingleFlight()
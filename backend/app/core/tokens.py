@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, List
+
+# ======================================================
+# 🔢 LOCAL TOKEN COUNTING
+# ======================================================
+# tiktoken when it is installed and its encoding can be loaded
+# (the BPE file is downloaded once, then cached); otherwise the
+# same ~4 chars/token estimate the LLM gateway uses. Servers call
+# preload_encodings() at startup (in a thread) so no request ever
+# waits on the download.
+
+# Per-message framing overhead of the chat format
+_MESSAGE_OVERHEAD = 4
+
+_encodings: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def _encoding(model: str):
+    if model in _encodings:
+        return _encodings[model]
+
+    with _lock:
+        if model not in _encodings:
+            try:
+                import tiktoken
+
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:  # not installed / BPE file unavailable
+                encoding = None
+            _encodings[model] = encoding
+
+    return _encodings[model]
+
+
+def preload_encodings(*models: str) -> None:
+    """
+    Load (and on a cold host download) the encodings now.
+    Blocking — run it off the event loop.
+    """
+    for model in models:
+        _encoding(model)
+
+
+def tokenizer_name(model: str) -> str:
+    encoding = _encoding(model)
+    return encoding.name if encoding is not None else "estimate(chars/4)"
+
+
+def count_tokens(text: str, model: str) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str) -> int:
+    return sum(
+        count_tokens(m.get("content") or "", model) + _MESSAGE_OVERHEAD
+        for m in messages
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    `text` cut to at most `max_tokens` tokens.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[: max_tokens * 4]
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+
+    return encoding.decode(tokens[:max_tokens])
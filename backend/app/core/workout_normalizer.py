@@ -1,22 +1,273 @@
-from typing import List, Dict
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# ======================================================
+# 🧠 WORKOUT PLAN PARSER
+# ======================================================
+# Single pass over the LLM's plan text. Keeps only lines that
+# carry training structure (sets / reps / time) and extracts:
+#   name, sets, reps ("10-12", "30 sec"), rest ("60 sec"), day
+# Headers ("Day 2 - Legs") set the day for the lines below;
+# prose (warm-up advice, notes) is skipped.
+#
+# Weekday headers ("Wednesday – Back") number training days in
+# order (next after the highest day so far), so a plan mixing
+# "Day 1" and weekday headers never files two days under one
+# number. Parsed lines are cached: the model repeats the same
+# exercise lines across plans, and headers/day are applied after.
+
+_DIGIT_RE = re.compile(r"\d")
+_LEAD_CHARS = " \t#>*•-–—"
+_NUMBERING_RE = re.compile(r"\d+[.)]\s+")
+_DAY_INITIALS = frozenset("DdMmTtWwFfSs")
+
+_DAY_RE = re.compile(
+    r"^(?:day\s*(\d+)|(monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b",
+    re.IGNORECASE,
+)
+
+# One scan per line: every number (or range) plus the unit after it.
+# Runs on the lower-cased line, so no IGNORECASE.
+_QUANTITY_RE = re.compile(
+    r"(\d+(?:\s*(?:-|–|—|to)\s*\d+)?)\s*"
+    r"(sets?|reps?|repetitions|rounds?|circuits?|x|×|seconds?|secs?|minutes?|mins?|s|m)?"
+    r"(?![a-z])"
+)
+_NAME_END_RE = re.compile(r"\s*(?::|\(|\s[-–—|]\s|,|\d)")
+_RANGE_SEP_RE = re.compile(r"\s*(?:-|–|—|to)\s*")
+_CANON_KEY_RE = re.compile(r"[^a-z0-9]+")
+_NAME_STRIP = " -–—:,."
+
+_SETS, _REPS, _X, _TIME = "sets", "reps", "x", "time"
+_UNIT_KINDS = {
+    **dict.fromkeys(("set", "sets", "round", "rounds", "circuit", "circuits"), _SETS),
+    **dict.fromkeys(("rep", "reps", "repetitions"), _REPS),
+    **dict.fromkeys(("x", "×"), _X),
+    **dict.fromkeys(("second", "seconds", "sec", "secs", "s"), _TIME),
+    **dict.fromkeys(("minute", "minutes", "min", "mins", "m"), _TIME),
+}
+_MINUTE_UNITS = frozenset(("minute", "minutes", "min", "mins", "m"))
+
+# "3 sets of 10 reps per leg" is not an exercise called "Per Leg"
+_NOT_NAMES = frozenset(("per", "each", "on", "with", "for", "at", "in", "and", "then"))
+
+# Common LLM spellings → one canonical name (deduplication key)
+CANONICAL_EXERCISES = {
+    "pushup": "Push-Up",
+    "pressup": "Push-Up",
+    "squat": "Squat",
+    "bodyweightsquat": "Bodyweight Squat",
+    "airsquat": "Bodyweight Squat",
+    "gobletsquat": "Goblet Squat",
+    "lunge": "Lunge",
+    "walkinglunge": "Walking Lunge",
+    "plank": "Plank",
+    "sideplank": "Side Plank",
+    "burpee": "Burpee",
+    "pullup": "Pull-Up",
+    "chinup": "Chin-Up",
+    "deadlift": "Deadlift",
+    "romaniandeadlift": "Romanian Deadlift",
+    "rdl": "Romanian Deadlift",
+    "benchpress": "Bench Press",
+    "dumbbellbenchpress": "Dumbbell Bench Press",
+    "shoulderpress": "Shoulder Press",
+    "overheadpress": "Overhead Press",
+    "dumbbellshoulderpress": "Dumbbell Shoulder Press",
+    "dumbbellrow": "Dumbbell Row",
+    "bentoverrow": "Bent-Over Row",
+    "latpulldown": "Lat Pulldown",
+    "bicepcurl": "Bicep Curl",
+    "bicepscurl": "Bicep Curl",
+    "dumbbellcurl": "Bicep Curl",
+    "tricepdip": "Tricep Dip",
+    "tricepsdip": "Tricep Dip",
+    "dip": "Dip",
+    "glutebridge": "Glute Bridge",
+    "hipthrust": "Hip Thrust",
+    "mountainclimber": "Mountain Climber",
+    "jumpingjack": "Jumping Jack",
+    "crunch": "Crunch",
+    "bicyclecrunch": "Bicycle Crunch",
+    "legraise": "Leg Raise",
+    "russiantwist": "Russian Twist",
+    "calfraise": "Calf Raise",
+    "legpress": "Leg Press",
+    "stepup": "Step-Up",
+    "kettlebellswing": "Kettlebell Swing",
+    "wallsit": "Wall Sit",
+    "superman": "Superman",
+    "birddog": "Bird Dog",
+    "boxjump": "Box Jump",
+}
+
+
+@lru_cache(maxsize=4096)
+def canonical_exercise_name(name: str) -> str:
+    key = _CANON_KEY_RE.sub("", name.lower())
+
+    canonical = CANONICAL_EXERCISES.get(key)
+    if canonical is None and key.endswith("es"):
+        canonical = CANONICAL_EXERCISES.get(key[:-2])
+    if canonical is None and key.endswith("s"):
+        canonical = CANONICAL_EXERCISES.get(key[:-1])
+
+    if canonical is not None:
+        return canonical
+
+    return " ".join(word[:1].upper() + word[1:] for word in name.split())
+
+
+def _range(text: str) -> str:
+    if text.isdigit():
+        return text
+    return _RANGE_SEP_RE.sub("-", text)
+
+
+def _duration(amount: str, unit: str) -> str:
+    unit = "min" if unit in _MINUTE_UNITS else "sec"
+    return f"{_range(amount)} {unit}"
+
+
+def _trailing_name(text: str) -> str:
+    text = text.lstrip(_NAME_STRIP)
+    if text.startswith("of "):
+        text = text[3:]
+    end = _NAME_END_RE.search(text)
+    name = text[:end.start() if end else len(text)].strip(_NAME_STRIP)
+    if name.split(" ", 1)[0] in _NOT_NAMES:
+        return ""
+    return name
+
+
+@lru_cache(maxsize=4096)
+def _parse_line(line: str) -> Optional[Tuple]:
+    """
+    (name, sets, reps, rest) for an exercise line, else None.
+    """
+    low = line.lower()
+    if len(low) != len(line):
+        line = low  # keep match offsets valid for the name slice
+
+    sets: Optional[int] = None
+    reps: Optional[str] = None
+    rest: Optional[str] = None
+    timed: Optional[str] = None
+    cut = len(line)
+    tail = 0  # end of the last sets/reps quantity
+    after_x = False
+
+    for match in _QUANTITY_RE.finditer(low):
+        amount, unit = match.groups()
+        kind = _UNIT_KINDS.get(unit)
+
+        if after_x:
+            after_x = False
+            if kind is None or kind is _REPS:
+                reps = amount if amount.isdigit() else _range(amount)
+                tail = match.end()
+                continue
+            if kind is _TIME:
+                reps = _duration(amount, unit)
+                tail = match.end()
+                continue
+
+        start = match.start()
+
+        if kind is None:
+            label = low[max(0, start - 8):start].rstrip(" :=")
+            if label.endswith("set") or label.endswith("sets"):
+                if amount.isdigit():
+                    sets = int(amount)
+                cut = min(cut, low.rfind("set", 0, start))
+            elif label.endswith("rep") or label.endswith("reps"):
+                reps = _range(amount)
+                cut = min(cut, low.rfind("rep", 0, start))
+            continue
+
+        if kind is _REPS:
+            reps = amount if amount.isdigit() else _range(amount)
+            tail = match.end()
+            if start < cut:
+                cut = start
+        elif kind is not _TIME:  # sets / rounds / "x"
+            if amount.isdigit():
+                sets = int(amount)
+                tail = match.end()
+                if start < cut:
+                    cut = start
+                # "3x12", "3 sets of 12", "3 rounds of 20" → reps follow
+                after_x = kind is _X or low.startswith(" of ", tail)
+        elif (
+            "rest" in low[max(0, start - 12):start]
+            or low[match.end():match.end() + 9].lstrip().startswith(("rest", "of rest"))
+        ):
+            rest = _duration(amount, unit)
+        elif timed is None:
+            timed = _duration(amount, unit)
+
+    if reps is None and sets is not None:
+        reps = timed
+
+    if sets is None and reps is None:
+        return None
+
+    end = _NAME_END_RE.search(line)
+    name = line[:min(cut, end.start() if end else cut)].strip(_NAME_STRIP)
+
+    if not name and tail:
+        # Quantities first: "3 sets of 15 squats"
+        name = _trailing_name(line[tail:])
+
+    if not name or not name[0].isalpha():
+        return None
+
+    return canonical_exercise_name(name), sets, reps, rest
+
 
 def normalize_workout_plan(plan: str) -> List[Dict]:
     if not plan:
         return []
 
     normalized = []
+    day: Optional[int] = None
+    last_day = 0
+
+    for raw in plan.splitlines():
+        line = raw.lstrip(_LEAD_CHARS)
+        if not line:
+            continue
 
-    lines = plan.split("\n")
-    for line in lines:
+        has_digit = _DIGIT_RE.search(line) is not None
+        if not has_digit and line[0] not in _DAY_INITIALS:
+            continue
+
+        if "*" in line or "_" in line or "`" in line:
+            line = line.replace("**", "").replace("__", "").replace("`", "")
+        if line[0].isdigit():
+            numbering = _NUMBERING_RE.match(line)
+            if numbering:
+                line = line[numbering.end():]
         line = line.strip()
         if not line:
             continue
 
-        normalized.append({
-            "name": line,
-            "sets": None,
-            "reps": None,
-            "rest": None,
-        })
+        if line[0] in _DAY_INITIALS:
+            header = _DAY_RE.match(line)
+            if header:
+                day = int(header.group(1)) if header.group(1) else last_day + 1
+                last_day = max(last_day, day)
+                continue
+
+        if not has_digit:
+            continue
+
+        exercise = _parse_line(line)
+        if exercise is not None:
+            name, sets, reps, rest = exercise
+            normalized.append(
+                {"name": name, "sets": sets, "reps": reps, "rest": rest, "day": day}
+            )
 
     return normalized
@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+import models
+import schemas
+from auth import get_current_user_async
+from database import get_async_db
+from exercise_store import workout_memory_item
+from projections import (
+    project,
+    projection_options,
+    route_fields,
+)
+from workout_tips import aget_or_generate_tips
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    apply_keyset,
+    listing_response,
+    split_page,
+)
+
+# ======================================================
+# ⚡ ASYNC READ ROUTES (ASYNC_DATABASE_URL)
+# ======================================================
+# AsyncSession ports of the hot read endpoints. main.py mounts
+# this router ahead of the sync routes only when the async
+# engine is configured, so these shadow the sync handlers
+# with the exact same paths, params and response shapes.
+router = APIRouter(include_in_schema=False)
+
+
+async def _apaginate(db: AsyncSession, stmt, model, limit, cursor):
+    """
+    Async `_paginate`: returns (rows, paginated, next_cursor).
+    """
+    if limit is None and cursor is None:
+        result = await db.scalars(stmt.order_by(model.created_at.desc()))
+        return result.all(), False, None
+
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    try:
+        stmt = apply_keyset(stmt, model, limit, cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows, next_cursor = split_page((await db.scalars(stmt)).all(), limit)
+    return rows, True, next_cursor
+
+
+@router.get("/me", response_model=schemas.UserResponse)
+async def get_profile(
+    current_user: models.User = Depends(get_current_user_async),
+):
+    return current_user
+
+
+@router.get("/workouts/memory")
+async def get_workouts_with_memory(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    view: Literal["full", "summary"] = Query(default="full"),
+    fields: Optional[str] = Query(default=None),
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    names = route_fields(models.Workout, view, fields)
+    stmt = select(models.Workout).where(models.Workout.user_id == current_user.id)
+
+    if names is None:
+        stmt = stmt.options(selectinload(models.Workout.normalized_exercises))
+    else:
+        stmt = stmt.options(*projection_options(models.Workout, names))
+
+    workouts, paginated, next_cursor = await _apaginate(
+        db, stmt, models.Workout, limit, cursor
+    )
+
+    if names is None:
+        items = [workout_memory_item(w) for w in workouts]
+    else:
+        items = [project(w, names) for w in workouts]
+
+    return listing_response(items, paginated, next_cursor)
+
+
+@router.get(
+    "/diets",
+    response_model=Union[list[schemas.DietResponse], schemas.DietPage],
+)
+async def get_diets(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    view: Literal["full", "summary"] = Query(default="full"),
+    fields: Optional[str] = Query(default=None),
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    names = route_fields(models.Diet, view, fields)
+    stmt = select(models.Diet).where(models.Diet.user_id == current_user.id)
+
+    if names is not None:
+        stmt = stmt.options(*projection_options(models.Diet, names))
+
+    diets, paginated, next_cursor = await _apaginate(
+        db, stmt, models.Diet, limit, cursor
+    )
+
+    if names is not None:
+        return listing_response(
+            [project(d, names) for d in diets], paginated, next_cursor
+        )
+
+    if not paginated:
+        return diets
+
+    return {"items": diets, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/workout-tips/{workout_id}",
+    response_model=schemas.WorkoutTipsGenerateResponse,
+)
+async def get_workout_tips_by_workout_id(
+    workout_id: int,
+    regenerate: bool = Query(
+        default=False,
+        description="Force regenerate tips using OpenAI"
+    ),
+    current_user: models.User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    workout = await db.scalar(
+        select(models.Workout).where(
+            models.Workout.id == workout_id,
+            models.Workout.user_id == current_user.id,
+        )
+    )
+
+    if not workout:
+        raise HTTPException(status_code=404, detail="Workout not found")
+
+    data = await aget_or_generate_tips(db, workout.workout_plan, regenerate)
+
+    return schemas.WorkoutTipsGenerateResponse(
+        **data,
+        created_at=datetime.utcnow(),
+    )
@@ -1,27 +1,88 @@
-from passlib.context import CryptContext
+import asyncio
+import hmac
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import models
-from database import get_db
+from database import get_async_db, get_db
+from app.core import metrics, password_hashing
+from app.core.cache import LRUCache
 
 # ---------------- Password Hashing ----------------
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto"
-)
+# bcrypt is ~250ms of GIL-held CPU at default cost, so the async
+# routes run it in a process pool. At most HASH_QUEUE_SIZE hashes
+# may be pending; beyond that callers wait up to
+# HASH_QUEUE_TIMEOUT seconds, then get a 503. The pool and the
+# semaphore are created by the app lifespan: the semaphore binds
+# to the serving event loop, which is new after each restart.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 2))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", HASH_WORKERS * 4))
+HASH_QUEUE_TIMEOUT = float(os.getenv("HASH_QUEUE_TIMEOUT", 5))
+
+pwd_context = password_hashing.pwd_context
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_slots: Optional[asyncio.Semaphore] = None
+
+
+def start_hash_pool() -> None:
+    """
+    Must be called from the serving event loop.
+    """
+    global _hash_pool, _hash_slots
+    if _hash_pool is None:
+        # spawn: never fork a threaded server process
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _hash_slots = asyncio.Semaphore(HASH_QUEUE_SIZE)
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool, _hash_slots
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+        _hash_slots = None
+
+
+async def _run_in_hash_pool(fn, *args):
+    pool, slots = _hash_pool, _hash_slots
+    if pool is None:
+        raise RuntimeError("Hash pool is not running (start_hash_pool)")
+
+    try:
+        await asyncio.wait_for(slots.acquire(), HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, fn, *args)
+    finally:
+        slots.release()
+
 
 def hash_password(password: str) -> str:
     """
     Hash password safely.
     bcrypt max length is 72 chars.
     """
-    return pwd_context.hash(password[:72])
+    return password_hashing.hash_password(password)
 
 def verify_password(password: str, hashed: str) -> bool:
     """
@@ -30,6 +91,27 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password[:72], hashed)
 
 
+async def ahash_password(password: str) -> str:
+    """
+    hash_password in the process pool.
+    """
+    return await _run_in_hash_pool(password_hashing.hash_password, password)
+
+
+async def averify_password(
+    password: str,
+    hashed: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify in the process pool.
+    Returns (valid, new_hash) — new_hash is set when the stored
+    hash's cost differs from BCRYPT_ROUNDS and should be saved.
+    """
+    return await _run_in_hash_pool(
+        password_hashing.verify_and_update, password, hashed
+    )
+
+
 # ---------------- JWT Settings ----------------
 # ⚠️ IMPORTANT: Move this to ENV in production
 SECRET_KEY = "your_secret_key_here_change_this"
@@ -74,17 +156,48 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# ---------------- USER CACHE ----------------
+# Token subject (email) → detached User snapshot.
+# Saves the users SELECT on every authenticated request;
+# changes propagate within AUTH_USER_CACHE_TTL seconds
+# (immediately in-process via the listeners below).
+user_cache = LRUCache(
+    maxsize=int(os.getenv("AUTH_USER_CACHE_SIZE", 1024)),
+    ttl=float(os.getenv("AUTH_USER_CACHE_TTL", 30)),
+)
+
+
+def _snapshot(user: models.User) -> models.User:
+    """
+    Transient copy of the column values — safe to share across
+    requests because it is bound to no session.
+    """
+    return models.User(**{
+        column.key: getattr(user, column.key)
+        for column in models.User.__table__.columns
+    })
+
+
+def invalidate_cached_user(email: Optional[str]) -> None:
+    if email:
+        user_cache.pop(email)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target):
+    invalidate_cached_user(target.email)
+
+    # Email changes: drop the old key as well
+    for old_email in inspect(target).attrs.email.history.deleted:
+        invalidate_cached_user(old_email)
+
+
 # ---------------- AUTH DEPENDENCY ----------------
 # ✅ tokenUrl MUST match the login endpoint exactly
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
-    """
-    Get currently authenticated user from JWT token.
-    """
+def _token_email(token: str) -> str:
     payload = verify_token(token)
 
     if payload is None:
@@ -101,16 +214,108 @@ def get_current_user(
             detail="Token missing subject",
         )
 
-    user = (
-        db.query(models.User)
-        .filter(models.User.email == email)
-        .first()
-    )
+    return email
+
 
+def _cache_user(email: str, user: Optional[models.User]) -> models.User:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    return user
+    snapshot = _snapshot(user)
+    user_cache.set(email, snapshot)
+
+    return snapshot
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Get currently authenticated user from JWT token.
+    """
+    with metrics.time_stage("auth_decode"):
+        email = _token_email(token)
+
+    cached = user_cache.get(email)
+    if cached is not None:
+        return cached
+
+    with metrics.time_stage("user_lookup"):
+        user = (
+            db.query(models.User)
+            .filter(models.User.email == email)
+            .first()
+        )
+
+    return _cache_user(email, user)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    `get_current_user` for the AsyncSession routes (same cache).
+    """
+    with metrics.time_stage("auth_decode"):
+        email = _token_email(token)
+
+    cached = user_cache.get(email)
+    if cached is not None:
+        return cached
+
+    with metrics.time_stage("user_lookup"):
+        user = await db.scalar(
+            select(models.User).where(models.User.email == email).limit(1)
+        )
+
+    return _cache_user(email, user)
+
+
+# ---------------- ADMIN / OPERATIONS ----------------
+# Stats endpoints expose pool sizes, queue depths and limiter
+# budgets — admins only (users.role). /metrics also accepts a
+# static METRICS_TOKEN bearer so Prometheus can scrape it
+# without a user account.
+ADMIN_ROLE = "admin"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+_optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login", auto_error=False)
+
+
+def get_current_admin(
+    current_user: models.User = Depends(get_current_user),
+) -> models.User:
+    if current_user.role != ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+
+    return current_user
+
+
+def require_metrics_access(
+    token: Optional[str] = Depends(_optional_oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> None:
+    """
+    METRICS_TOKEN bearer, or an admin's access token.
+    """
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if METRICS_TOKEN and hmac.compare_digest(
+        token.encode("utf-8"), METRICS_TOKEN.encode("utf-8")
+    ):
+        return
+
+    get_current_admin(get_current_user(token, db))
@@ -0,0 +1,35 @@
+"""
+Backfill normalized_exercises for workouts stored before
+exercises were persisted at write time, then rebuild the
+per-user user_exercise_stats aggregate from them.
+
+Usage:
+    python backfill_normalized_exercises.py [--batch-size 200]
+"""
+import argparse
+
+from database import SessionLocal
+from exercise_store import (
+    backfill_normalized_exercises,
+    rebuild_exercise_stats,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = backfill_normalized_exercises(db, args.batch_size)
+        stats = rebuild_exercise_stats(db)
+    finally:
+        db.close()
+
+    print(f"Backfilled normalized exercises for {count} workouts")
+    print(f"Rebuilt {stats} user exercise stat rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Throughput of normalize_workout_plan (plans/s, one core).
+
+Runs the parser over the fake-LLM plan and the test corpus of
+real model-output formats (tests/plan_corpus.py). Target: 10k
+plans/s on the 16-line fake plan.
+
+"cold" clears the parsed-line cache before every plan (first
+sight of each line); "warm" is the steady state when the model
+repeats exercise lines across plans.
+
+Usage:
+    python bench_normalizer.py [--seconds 2]
+"""
+import argparse
+import time
+
+from app.core.fake_llm import FAKE_PLAN
+from app.core.workout_normalizer import (
+    _parse_line,
+    canonical_exercise_name,
+    normalize_workout_plan,
+)
+from tests.plan_corpus import PLANS
+
+
+def _cold(plan: str):
+    _parse_line.cache_clear()
+    canonical_exercise_name.cache_clear()
+    return normalize_workout_plan(plan)
+
+
+def _rate(parse, plans, seconds: float) -> float:
+    for plan in plans:  # warm up
+        parse(plan)
+
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for plan in plans:
+            parse(plan)
+        done += len(plans)
+
+    return done / (time.perf_counter() - start)
+
+
+def _report(label: str, plans, seconds: float) -> None:
+    cold = _rate(_cold, plans, seconds)
+    warm = _rate(normalize_workout_plan, plans, seconds)
+    print(f"{label:<32} cold {cold:>8,.0f}  warm {warm:>8,.0f} plans/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    _report(f"fake plan ({len(FAKE_PLAN.splitlines())} lines)", [FAKE_PLAN], args.seconds)
+
+    corpus = list(PLANS.values())
+    lines = sum(len(p.splitlines()) for p in corpus) / len(corpus)
+    _report(f"corpus ({len(corpus)} plans, ~{lines:.0f} lines)", corpus, args.seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Input tokens per tips request: full plan text vs. the compact
+exercise summary (app/core/plan_summary.py).
+
+Builds a fixture corpus of verbose, varied 3-5 day plans (the
+shape gpt-4o-mini returns for /workouts/generate) and counts the
+prompt tokens of both variants with the local tokenizer.
+
+Usage:
+    python bench_prompt_tokens.py [--plans 200] [--seed 7]
+"""
+import argparse
+import random
+import statistics
+
+import workout_tips
+from app.core.plan_summary import compact_plan
+from app.core.prompts import WORKOUT_TIPS
+from app.core.tokens import count_message_tokens, tokenizer_name
+from app.core.workout_normalizer import CANONICAL_EXERCISES
+
+_EXERCISES = sorted(set(CANONICAL_EXERCISES.values()))
+_FOCUS = ("Upper Body", "Lower Body", "Full Body", "Push", "Pull", "Legs", "Core")
+_ADVICE = (
+    "Keep your core tight and breathe out on the effort.",
+    "Move with a slow, controlled tempo through the full range of motion.",
+    "Keep your knees behind your toes and your shoulders down and back.",
+    "If you feel any pain, stop and rest before continuing.",
+    "Increase the weight slightly next week if the last set feels easy.",
+    "Drink water between sets and rest longer if you need to.",
+)
+
+
+def _plan(rng: random.Random) -> str:
+    lines = [
+        "Here is your personalized workout plan!",
+        "",
+        "Warm-up (every session): 5-10 minutes of light cardio such as brisk "
+        "walking or cycling, followed by arm circles, leg swings and hip openers.",
+        "",
+    ]
+
+    for day in range(1, rng.randint(3, 5) + 1):
+        lines.append(f"Day {day} - {rng.choice(_FOCUS)}")
+        for i, name in enumerate(rng.sample(_EXERCISES, rng.randint(4, 6)), 1):
+            lines.append(
+                f"{i}. {name}: {rng.randint(2, 4)} sets x "
+                f"{rng.choice(('8', '10', '12', '15', '10-12', '8-10'))} reps, "
+                f"rest {rng.choice((30, 45, 60, 90))} sec"
+            )
+            if rng.random() < 0.5:
+                lines.append(f"   Tip: {rng.choice(_ADVICE)}")
+        lines.append("")
+
+    lines += [
+        "Cool-down: 5-10 minutes of stretching for the hamstrings, quads, "
+        "chest and shoulders. Hold each stretch for 20-30 seconds.",
+        "",
+        "Remember to sleep well, eat enough protein and listen to your body.",
+    ]
+    return "\n".join(lines)
+
+
+def _stats(values) -> str:
+    ordered = sorted(values)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return (
+        f"mean {statistics.mean(values):7.1f}  p50 {statistics.median(values):6.0f}"
+        f"  p95 {p95:6d}  max {max(values):6d}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [_plan(rng) for _ in range(args.plans)]
+    model = workout_tips.TIPS_MODEL
+
+    before = [
+        count_message_tokens(WORKOUT_TIPS.messages(plan=plan), model)
+        for plan in corpus
+    ]
+    after = [
+        count_message_tokens(workout_tips._tips_params(plan)["messages"], model)
+        for plan in corpus
+    ]
+
+    print(f"tokenizer: {tokenizer_name(model)}   plans: {len(corpus)}")
+    print(f"full plan     {_stats(before)}")
+    print(f"compact       {_stats(after)}")
+    print(
+        f"reduction     {1 - sum(after) / sum(before):.0%} input tokens "
+        f"(summary budget {workout_tips.TIPS_INPUT_MAX_TOKENS}, "
+        f"completion cap {workout_tips.TIPS_MAX_TOKENS})"
+    )
+    print()
+    print("example summary:")
+    print(compact_plan(corpus[0], workout_tips.TIPS_INPUT_MAX_TOKENS, model))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Bytes on the wire and CPU per request for the plan-heavy list
+endpoints (/workouts/memory, /diets), full and view=summary.
+
+Seeds a throwaway SQLite database, then calls the real app
+in-process once per Accept-Encoding. CPU is process time for the
+whole request (routing, DB, serialization, compression) as seen
+by this single-threaded client.
+
+Usage:
+    python bench_responses.py [--rows 50] [--requests 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(), "bench_responses.db")
+os.environ.update(DATABASE_URL=f"sqlite:///{_DB}", DB_CREATE_ALL="1")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import auth  # noqa: E402
+import main  # noqa: E402
+import models  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from exercise_store import attach_normalized_exercises  # noqa: E402
+from app.core.workout_normalizer import CANONICAL_EXERCISES  # noqa: E402
+
+_EXERCISES = sorted(set(CANONICAL_EXERCISES.values()))
+_WORDS = (
+    "keep your core tight and breathe out on the effort slow controlled "
+    "tempo full range of motion knees behind toes shoulders down and back "
+    "drive through the heels pause at the top lower with control avoid "
+    "arching rest longer if needed increase weight next week stretch hips "
+    "hamstrings chest light cardio hydrate well sleep recovery form first"
+).split()
+
+
+def _plan(seed: int) -> str:
+    # ~2 KB and different per row, like real generated plans
+    rng = random.Random(seed)
+    lines = []
+
+    for day in range(1, 4):
+        lines.append(f"Day {day} - {rng.choice(('Upper', 'Lower', 'Full'))} Body")
+        for _ in range(5):
+            lines.append(
+                f"{rng.choice(_EXERCISES)}: {rng.randint(2, 5)} sets x "
+                f"{rng.randint(6, 15)} reps, rest {rng.choice((30, 45, 60, 90))} sec"
+            )
+        lines.append(" ".join(rng.choice(_WORDS) for _ in range(40)).capitalize() + ".")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+PROFILE = dict(
+    name="Bench",
+    age=30,
+    weight=80,
+    weight_unit="kg",
+    height=180,
+    height_unit="cm",
+    blood_group="O+",
+    fitness_goal="muscle gain",
+    medical_condition="none",
+)
+
+
+def _seed(rows: int) -> str:
+    db = SessionLocal()
+    try:
+        user = models.User(
+            email="bench@example.com",
+            password="x",
+            first_name="Bench",
+            last_name="User",
+            username="bench",
+        )
+        db.add(user)
+        db.flush()
+
+        for i in range(rows):
+            db.add(attach_normalized_exercises(models.Workout(
+                user_id=user.id,
+                workout_preference="gym",
+                workout_plan=_plan(i),
+                **PROFILE,
+            )))
+            db.add(models.Diet(
+                user_id=user.id,
+                diet_preference="balanced",
+                diet_plan=_plan(rows + i),
+                **PROFILE,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    return auth.create_access_token({"sub": "bench@example.com"})
+
+
+def main_() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with TestClient(main.app) as client:
+        token = _seed(args.rows)
+
+        print(f"{'endpoint':<32}{'encoding':<10}{'bytes':>10}{'cpu ms/req':>12}")
+        for path in (
+            "/workouts/memory",
+            "/workouts/memory?view=summary",
+            "/diets",
+            "/diets?view=summary",
+        ):
+            for encoding in ("identity", "gzip", "br"):
+                headers = {
+                    "Authorization": f"Bearer {token}",
+                    "Accept-Encoding": encoding,
+                }
+                client.get(path, headers=headers)  # warm caches
+
+                start = time.process_time()
+                for _ in range(args.requests):
+                    response = client.get(path, headers=headers)
+                cpu = (time.process_time() - start) / args.requests
+
+                served = response.headers.get("content-encoding", "identity")
+                print(
+                    f"{path:<32}{served:<10}"
+                    f"{response.num_bytes_downloaded:>10}{cpu * 1000:>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,66 @@
+"""
+Cold-start benchmark for an API worker.
+
+Each run is a fresh interpreter that imports `main` (building the
+app) and enters + exits its lifespan — the work a uvicorn/gunicorn
+worker does before it can serve a request.
+
+Usage:
+    python bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import asyncio, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def cycle():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(cycle())
+t2 = time.perf_counter()
+print(f"{t1 - t0} {t2 - t1}")
+"""
+
+
+def _run_once() -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_s, lifespan_s = out.stdout.split()[-2:]
+    return float(import_s), float(lifespan_s)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    _run_once()  # warm the OS page cache / .pyc files
+
+    samples = [_run_once() for _ in range(args.runs)]
+
+    for label, values in (
+        ("import main", [s[0] for s in samples]),
+        ("lifespan", [s[1] for s in samples]),
+        ("total", [s[0] + s[1] for s in samples]),
+    ):
+        print(
+            f"{label:<12} median {statistics.median(values) * 1000:8.1f} ms"
+            f"   min {min(values) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Retention / compaction for ai_insights.
+
+Before insights were memoized, every GET /workouts/insights
+inserted a row, so most users have long runs of duplicates.
+
+Usage:
+    python compact_ai_insights.py [--keep 5] [--max-age-days 90]
+"""
+import argparse
+
+from database import SessionLocal
+from insight_store import compact_ai_insights
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keep", type=int, default=5)
+    parser.add_argument("--max-age-days", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = compact_ai_insights(db, args.keep, args.max_age_days)
+    finally:
+        db.close()
+
+    print(f"Deleted {deleted} ai_insights rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+import models
+from database import SessionLocal
+from email_service import SMTPConnection, build_contact_message
+from app.core import metrics
+
+# ======================================================
+# 📮 OUTBOX (DURABLE EMAIL QUEUE + BACKGROUND SENDER)
+# ======================================================
+# /contact only inserts a row and answers 202. A sender task per
+# worker claims due rows in batches, sends them over one reused
+# SMTP session and records the outcome:
+#   pending  → sending (claimed; next_attempt_at = lease expiry)
+#   sending  → sent | pending (retry with backoff) | failed
+# A worker that dies mid-batch leaves rows in `sending`; they are
+# picked up again once the lease expires.
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 20))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", 5))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 8))
+EMAIL_BACKOFF_BASE = float(os.getenv("EMAIL_BACKOFF_BASE", 30))
+EMAIL_BACKOFF_MAX = float(os.getenv("EMAIL_BACKOFF_MAX", 3600))
+EMAIL_CLAIM_LEASE = float(os.getenv("EMAIL_CLAIM_LEASE", 120))
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _backoff(attempts: int) -> timedelta:
+    delay = min(EMAIL_BACKOFF_MAX, EMAIL_BACKOFF_BASE * (2 ** (attempts - 1)))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+
+def enqueue_contact_email(db: Session, name: str, email: str, message: str) -> int:
+    """
+    Durably queue a contact message; returns the outbox id.
+    """
+    row = models.OutboundEmail(
+        kind="contact",
+        payload={"name": name, "email": email, "message": message},
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=_now(),
+    )
+    db.add(row)
+    db.commit()
+    return row.id
+
+
+def _build_message(row: models.OutboundEmail):
+    payload = row.payload
+    return build_contact_message(
+        payload["name"], payload["email"], payload["message"]
+    )
+
+
+class EmailSender:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        connection: Optional[SMTPConnection] = None,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        poll_interval: float = EMAIL_POLL_INTERVAL,
+    ):
+        self.session_factory = session_factory
+        self.connection = connection or SMTPConnection()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.sender_id = uuid.uuid4().hex
+
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.errors = 0  # drain passes that raised (DB down, ...)
+
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # =========================
+    # BLOCKING PART (THREAD)
+    # =========================
+    def _claim(self, db: Session):
+        now = _now()
+
+        due_ids = [
+            row_id
+            for (row_id,) in db.query(models.OutboundEmail.id)
+            .filter(
+                models.OutboundEmail.status.in_((PENDING, SENDING)),
+                models.OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(models.OutboundEmail.id)
+            .limit(self.batch_size)
+            .all()
+        ]
+        if not due_ids:
+            return []
+
+        # Conditional UPDATE — concurrent senders each win a disjoint subset
+        db.query(models.OutboundEmail).filter(
+            models.OutboundEmail.id.in_(due_ids),
+            models.OutboundEmail.status.in_((PENDING, SENDING)),
+            models.OutboundEmail.next_attempt_at <= now,
+        ).update(
+            {
+                "status": SENDING,
+                "claimed_by": self.sender_id,
+                "next_attempt_at": now + timedelta(seconds=EMAIL_CLAIM_LEASE),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+        return (
+            db.query(models.OutboundEmail)
+            .filter(
+                models.OutboundEmail.id.in_(due_ids),
+                models.OutboundEmail.status == SENDING,
+                models.OutboundEmail.claimed_by == self.sender_id,
+            )
+            .order_by(models.OutboundEmail.id)
+            .all()
+        )
+
+    def _deliver(self, row: models.OutboundEmail) -> bool:
+        """
+        Send one row and record the outcome. Returns False when the
+        SMTP session itself is down (no point trying the rest).
+        """
+        try:
+            self.connection.send(_build_message(row))
+        except Exception as e:
+            row.attempts += 1
+            row.last_error = f"{type(e).__name__}: {e}"[:1000]
+            row.claimed_by = None
+
+            if row.attempts >= EMAIL_MAX_ATTEMPTS:
+                row.status = FAILED
+                self.failed += 1
+            else:
+                row.status = PENDING
+                row.next_attempt_at = _now() + _backoff(row.attempts)
+                self.retried += 1
+            return self.connection.connected
+
+        row.attempts += 1
+        row.status = SENT
+        row.sent_at = _now()
+        row.last_error = None
+        row.claimed_by = None
+        self.sent += 1
+        return True
+
+    def _release(self, rows, delay: timedelta) -> None:
+        # Unsent rows of a batch whose SMTP session failed;
+        # no attempt is charged to them
+        retry_at = _now() + delay
+        for row in rows:
+            row.status = PENDING
+            row.claimed_by = None
+            row.next_attempt_at = retry_at
+
+    def drain_once(self) -> int:
+        """
+        Claim one batch and send it. Returns how many rows were claimed.
+        """
+        db = self.session_factory()
+        try:
+            rows = self._claim(db)
+            for i, row in enumerate(rows):
+                if not self._deliver(row):
+                    self._release(rows[i + 1:], _backoff(1))
+                    break
+            db.commit()
+            return len(rows)
+        finally:
+            db.close()
+
+    # =========================
+    # EVENT LOOP PART
+    # =========================
+    def wake(self) -> None:
+        """
+        Nudge the sender after an enqueue (skips the poll wait).
+        """
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await asyncio.to_thread(self.drain_once)
+            except Exception:
+                # Send failures are recorded on their rows; this is the
+                # claim/commit itself failing — retried next poll
+                logger.exception("email outbox drain failed")
+                metrics.BACKGROUND_FAILURES.labels("email_outbox").inc()
+                self.errors += 1
+                claimed = 0
+
+            # Full batch → more may be due; otherwise sleep until poked
+            if claimed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.connection.close)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "errors": self.errors,
+            "running": int(self._task is not None),
+        }
+
+
+def outbox_depth(db: Session) -> Dict[str, int]:
+    """
+    Rows not yet delivered, by status.
+    """
+    return {
+        status: db.query(models.OutboundEmail)
+        .filter(models.OutboundEmail.status == status)
+        .count()
+        for status in (PENDING, SENDING, FAILED)
+    }
+
+
+email_sender = EmailSender()
@@ -1,9 +1,13 @@
 import os
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
+from app.core import metrics
+
 load_dotenv()
 
 SMTP_HOST = os.getenv("SMTP_HOST")
@@ -11,11 +15,22 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_EMAIL = os.getenv("SMTP_EMAIL")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 
-if not all([SMTP_HOST, SMTP_EMAIL, SMTP_PASSWORD]):
-    raise ValueError("SMTP configuration missing in .env")
+# Local relays / aiosmtpd stand-ins: SMTP_STARTTLS=0 and no password
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
+
+# Servers drop idle sessions; close ours first and reconnect on demand
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", 60))
+
 
+def _require_smtp_config() -> None:
+    # Checked on first send, not at import, so the app can start
+    # (and tests can import it) without SMTP credentials
+    if not all([SMTP_HOST, SMTP_EMAIL]):
+        raise ValueError("SMTP configuration missing in .env")
 
-def send_contact_email(name: str, email: str, message: str):
+
+def build_contact_message(name: str, email: str, message: str) -> MIMEMultipart:
     subject = f"New Contact Message from {name}"
 
     body = f"""
@@ -32,13 +47,101 @@ def send_contact_email(name: str, email: str, message: str):
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "plain"))
 
-    try:
-        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_EMAIL, SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        print("SMTP ERROR:", e)
-        return False
+    return msg
+
+
+# ======================================================
+# 📮 REUSED SMTP CONNECTION
+# ======================================================
+class SMTPConnection:
+    """
+    One authenticated SMTP session kept open between sends.
+
+    Connect + STARTTLS + AUTH happen once; later messages reuse
+    the session until it idles out or the server drops it, in
+    which case the next send reconnects. Not for concurrent use —
+    the outbox sender is its only caller.
+    """
+
+    def __init__(self):
+        self._server = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        _require_smtp_config()
+
+        start = time.perf_counter()
+        server = None
+        try:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+            if SMTP_STARTTLS:
+                server.starttls()
+            if SMTP_PASSWORD:
+                server.login(SMTP_EMAIL, SMTP_PASSWORD)
+        except Exception:
+            metrics.observe_smtp("connect", "error", time.perf_counter() - start)
+            if server is not None:
+                server.close()
+            raise
+
+        metrics.observe_smtp("connect", "ok", time.perf_counter() - start)
+        return server
+
+    def _send_message(self, msg) -> None:
+        start = time.perf_counter()
+        try:
+            self._server.send_message(msg)
+        except Exception:
+            metrics.observe_smtp("send", "error", time.perf_counter() - start)
+            raise
+        metrics.observe_smtp("send", "ok", time.perf_counter() - start)
+
+    def send(self, msg) -> None:
+        with self._lock:
+            if self._server is not None and (
+                time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT
+            ):
+                self._quit()
+
+            if self._server is None:
+                self._server = self._connect()
+                fresh = True
+            else:
+                fresh = False
+
+            try:
+                self._send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+                if fresh:
+                    raise
+                # Stale pooled session — one retry on a new one
+                self._server = self._connect()
+                self._send_message(msg)
+            except smtplib.SMTPRecipientsRefused:
+                # Message-level failure; the session is still usable
+                self._last_used = time.monotonic()
+                raise
+            except Exception:
+                self._quit()
+                raise
+
+            self._last_used = time.monotonic()
+
+    @property
+    def connected(self) -> bool:
+        return self._server is not None
+
+    def _quit(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._quit()
@@ -0,0 +1,301 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, event, func, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+import models
+from app.core.workout_normalizer import normalize_workout_plan
+
+# ======================================================
+# 🧠 NORMALIZED EXERCISE PERSISTENCE
+# ======================================================
+# Plans are parsed once, when stored. Read endpoints use the
+# normalized_exercises rows instead of re-parsing plan text.
+# user_exercise_stats is kept in step with workout inserts and
+# deletes by the flush listeners below.
+
+
+def _to_row(ex: Dict) -> models.NormalizedExercise:
+    return models.NormalizedExercise(
+        name=(ex.get("name") or "")[:255],
+        sets=ex.get("sets"),
+        reps=(ex.get("reps") or None) and str(ex["reps"])[:50],
+        rest=(ex.get("rest") or None) and str(ex["rest"])[:50],
+        day=ex.get("day"),
+    )
+
+
+def attach_normalized_exercises(workout: models.Workout) -> models.Workout:
+    """
+    Parse the plan and attach rows; they are inserted in the
+    same flush as the workout.
+    """
+    workout.normalized_exercises = [
+        _to_row(ex) for ex in normalize_workout_plan(workout.workout_plan)
+    ]
+    return workout
+
+
+def exercise_dicts(workout: models.Workout, parse_fallback: bool = True) -> List[Dict]:
+    """
+    Stored rows for a workout (load with selectinload).
+    Falls back to parsing for workouts not yet backfilled, unless
+    `parse_fallback=False` (workout_plan not loaded, e.g. load_only).
+    """
+    if (
+        parse_fallback
+        and not workout.normalized_exercises
+        and workout.workout_plan
+    ):
+        return normalize_workout_plan(workout.workout_plan)
+
+    return [
+        {
+            "name": ex.name,
+            "sets": ex.sets,
+            "reps": ex.reps,
+            "rest": ex.rest,
+            "day": ex.day,
+        }
+        for ex in workout.normalized_exercises
+    ]
+
+
+def workout_memory_item(workout: models.Workout) -> Dict:
+    """
+    One /workouts/memory entry (sync and async routes share it).
+    """
+    return {
+        "id": workout.id,
+        "created_at": workout.created_at,
+        "name": workout.name,
+        "fitness_goal": workout.fitness_goal,
+        "workout_plan": workout.workout_plan,
+        "normalized_exercises": exercise_dicts(workout),
+    }
+
+
+def backfill_normalized_exercises(db: Session, batch_size: int = 200) -> int:
+    """
+    Populate normalized_exercises for workouts that have none.
+    Returns the number of workouts processed.
+    """
+    processed = 0
+    last_id = 0
+
+    while True:
+        workouts = (
+            db.query(models.Workout.id, models.Workout.workout_plan)
+            .filter(
+                models.Workout.id > last_id,
+                ~models.Workout.normalized_exercises.any(),
+            )
+            .order_by(models.Workout.id)
+            .limit(batch_size)
+            .all()
+        )
+
+        if not workouts:
+            return processed
+
+        rows = []
+        for workout_id, plan in workouts:
+            for ex in normalize_workout_plan(plan):
+                row = _to_row(ex)
+                row.workout_id = workout_id
+                rows.append(row)
+
+        db.add_all(rows)
+        db.commit()
+
+        processed += len(workouts)
+        last_id = workouts[-1].id
+
+
+# ======================================================
+# 📊 PER-USER EXERCISE STATS (INCREMENTAL)
+# ======================================================
+# Counts change through one atomic statement per (user, exercise,
+# day) — an upsert on insert, a decrement on delete — so concurrent
+# saves neither collide on the unique key nor overwrite each
+# other's counts. The day is always taken from the workout's
+# stored created_at (the server-side now() default), the same value
+# rebuild_exercise_stats reads.
+def _collect(deltas, user_id, exercises, when, sign) -> None:
+    day = when.date()
+    for ex in exercises:
+        if not ex.name:
+            continue
+        key = (user_id, ex.name.lower()[:255], day)
+        deltas[key] = deltas.get(key, 0) + sign
+
+
+def _stat_upsert(dialect: str):
+    table = models.UserExerciseStat.__table__
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(
+            count=table.c.count + stmt.inserted.count,
+            last_seen_at=func.greatest(
+                func.coalesce(table.c.last_seen_at, stmt.inserted.last_seen_at),
+                stmt.inserted.last_seen_at,
+            ),
+        )
+
+    stmt = sqlite.insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "exercise_name", "day"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            "last_seen_at": func.max(
+                func.coalesce(table.c.last_seen_at, stmt.excluded.last_seen_at),
+                stmt.excluded.last_seen_at,
+            ),
+        },
+    )
+
+
+def _add_stats(session: Session, workouts) -> None:
+    # created_at was just written by the DB; read back what it stored
+    stored = dict(
+        session.query(models.Workout.id, models.Workout.created_at)
+        .filter(models.Workout.id.in_([w.id for w in workouts]))
+        .all()
+    )
+
+    rows = []
+    for workout in workouts:
+        created_at = stored[workout.id]
+        deltas: Dict = {}
+        _collect(
+            deltas, workout.user_id, workout.normalized_exercises,
+            created_at, 1,
+        )
+        rows.extend(
+            {
+                "user_id": user_id,
+                "exercise_name": name,
+                "day": day,
+                "count": delta,
+                "last_seen_at": created_at,
+            }
+            for (user_id, name, day), delta in deltas.items()
+        )
+
+    if rows:
+        session.execute(_stat_upsert(session.get_bind().dialect.name), rows)
+
+
+def _remove_stats(session: Session, deltas) -> None:
+    stat = models.UserExerciseStat
+    for (user_id, name, day), delta in deltas.items():
+        session.execute(
+            update(stat)
+            .where(
+                stat.user_id == user_id,
+                stat.exercise_name == name,
+                stat.day == day,
+            )
+            .values(count=stat.count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+    session.execute(
+        delete(stat)
+        .where(
+            stat.user_id.in_({k[0] for k in deltas}),
+            stat.count <= 0,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _remove_deleted_workout_stats(session, flush_context, instances):
+    # Before the DELETE: created_at and the exercises must still load
+    deltas: Dict = {}
+    for obj in session.deleted:
+        if isinstance(obj, models.Workout) and obj.user_id and obj.created_at:
+            _collect(
+                deltas, obj.user_id, obj.normalized_exercises,
+                obj.created_at, -1,
+            )
+
+    if deltas:
+        _remove_stats(session, deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _add_new_workout_stats(session, flush_context):
+    # After the INSERT: ids are assigned and created_at is stored
+    workouts = [
+        obj for obj in session.new
+        if isinstance(obj, models.Workout) and obj.user_id
+    ]
+    if workouts:
+        _add_stats(session, workouts)
+
+
+def exercise_frequency(db: Session, user_id: int, days: int) -> Dict[str, int]:
+    """
+    {exercise name: count} over the last `days` days (UTC),
+    summed from the per-day aggregate rows.
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+    rows = (
+        db.query(
+            models.UserExerciseStat.exercise_name,
+            func.sum(models.UserExerciseStat.count),
+        )
+        .filter(
+            models.UserExerciseStat.user_id == user_id,
+            models.UserExerciseStat.day >= since,
+        )
+        .group_by(models.UserExerciseStat.exercise_name)
+        .all()
+    )
+
+    return {name: int(total) for name, total in rows}
+
+
+def rebuild_exercise_stats(db: Session) -> int:
+    """
+    Recompute user_exercise_stats from normalized_exercises
+    (after a backfill, or to repair drift). Returns row count.
+    """
+    rows = (
+        db.query(
+            models.Workout.user_id,
+            func.lower(models.NormalizedExercise.name),
+            func.date(models.Workout.created_at),
+            func.count(models.NormalizedExercise.id),
+            func.max(models.Workout.created_at),
+        )
+        .join(models.NormalizedExercise.workout)
+        .filter(models.Workout.user_id.isnot(None))
+        .group_by(
+            models.Workout.user_id,
+            func.lower(models.NormalizedExercise.name),
+            func.date(models.Workout.created_at),
+        )
+        .all()
+    )
+
+    db.query(models.UserExerciseStat).delete(synchronize_session=False)
+    db.add_all([
+        models.UserExerciseStat(
+            user_id=user_id,
+            exercise_name=name[:255],
+            day=day if isinstance(day, date) else date.fromisoformat(day),
+            count=count,
+            last_seen_at=last_seen,
+        )
+        for user_id, name, day, count, last_seen in rows
+    ])
+    db.commit()
+
+    return len(rows)
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+import models
+from app.core.cache import content_hash
+
+# ======================================================
+# 🔑 IDEMPOTENCY-KEY SUPPORT (GENERATE ENDPOINTS)
+# ======================================================
+# Clients (mobile, axios retry) resend POST /workouts/generate
+# and /diet/generate on timeout. With an `Idempotency-Key` header
+# the first request claims an idempotency_keys row; a retry with
+# the same key and body then
+#   - replays the stored response when the first one finished
+#   - waits for it (attaches) while it is still in progress
+# instead of paying for a second completion and inserting a
+# duplicate row. The same key with a different body → 422.
+#
+# Failed requests delete their row, so a retry regenerates.
+# A worker that dies mid-request leaves an in_progress row whose
+# lock is taken over after IDEMPOTENCY_LOCK_TIMEOUT.
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", 24)))
+IDEMPOTENCY_LOCK_TIMEOUT = timedelta(
+    seconds=float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 300))
+)
+# How long a retry waits on an in-progress original before 409
+IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", 90))
+IDEMPOTENCY_POLL = 0.5
+
+MAX_KEY_LENGTH = 255
+
+# Same-process originals, so retries attach without polling MySQL
+_inflight: Dict[Tuple, asyncio.Future] = {}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # created_at / locked_at are always written from _now() (never
+    # the DB's now(), which follows the server time zone); drivers
+    # that drop tzinfo (SQLite, MySQL DATETIME) hand them back naive
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def request_fingerprint(body: Dict[str, Any]) -> str:
+    return content_hash(json.dumps(jsonable_encoder(body), sort_keys=True))
+
+
+# =========================
+# ROW OPERATIONS (BLOCKING)
+# =========================
+def _lookup(db: Session, user_id: int, endpoint: str, key: str):
+    return (
+        db.query(models.IdempotencyKey)
+        .filter(
+            models.IdempotencyKey.user_id == user_id,
+            models.IdempotencyKey.endpoint == endpoint,
+            models.IdempotencyKey.key == key,
+        )
+        .first()
+    )
+
+
+def _take_over(db: Session, row, fingerprint: str) -> bool:
+    # Conditional on the lock we saw — only one retry wins
+    claimed = (
+        db.query(models.IdempotencyKey)
+        .filter(
+            models.IdempotencyKey.id == row.id,
+            models.IdempotencyKey.locked_at == row.locked_at,
+        )
+        .update(
+            {
+                "request_hash": fingerprint,
+                "status": IN_PROGRESS,
+                "status_code": None,
+                "response": None,
+                "locked_at": _now(),
+                "created_at": _now(),
+                "completed_at": None,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return claimed == 1
+
+
+def _wait(db: Session) -> Tuple[None, None]:
+    # End the transaction so the next poll sees the original's commit
+    # (identity map + REPEATABLE READ snapshot would hide it)
+    db.rollback()
+    return None, None
+
+
+def claim(
+    db: Session,
+    user_id: int,
+    endpoint: str,
+    key: str,
+    fingerprint: str,
+) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """
+    (row id, None) → caller owns the key and must complete/release it.
+    (None, stored) → replay `stored` ({"status_code", "content"}).
+    (None, None)   → another request holds the key; wait and retry.
+    """
+    row = _lookup(db, user_id, endpoint, key)
+    now = _now()
+
+    if row is None:
+        row = models.IdempotencyKey(
+            user_id=user_id,
+            endpoint=endpoint,
+            key=key,
+            request_hash=fingerprint,
+            status=IN_PROGRESS,
+            locked_at=now,
+            created_at=now,
+        )
+        db.add(row)
+        try:
+            db.commit()
+            return row.id, None
+        except IntegrityError:
+            # A concurrent retry inserted it first
+            db.rollback()
+            row = _lookup(db, user_id, endpoint, key)
+            if row is None:
+                return _wait(db)
+
+    expired = now - (_aware(row.created_at) or now) > IDEMPOTENCY_TTL
+    stale = (
+        row.status == IN_PROGRESS
+        and now - _aware(row.locked_at) > IDEMPOTENCY_LOCK_TIMEOUT
+    )
+
+    if expired or stale:
+        if _take_over(db, row, fingerprint):
+            return row.id, None
+        return _wait(db)
+
+    if row.request_hash != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request body",
+        )
+
+    if row.status == COMPLETED:
+        return None, {"status_code": row.status_code, "content": row.response}
+
+    return _wait(db)
+
+
+def complete(db: Session, row_id: int, status_code: int, content: Any) -> None:
+    db.query(models.IdempotencyKey).filter(
+        models.IdempotencyKey.id == row_id
+    ).update(
+        {
+            "status": COMPLETED,
+            "status_code": status_code,
+            "response": content,
+            "completed_at": _now(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def release(db: Session, row_id: int) -> None:
+    db.rollback()
+    db.query(models.IdempotencyKey).filter(
+        models.IdempotencyKey.id == row_id,
+        models.IdempotencyKey.status == IN_PROGRESS,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def purge_expired_keys(db: Session) -> int:
+    """
+    Delete rows older than IDEMPOTENCY_TTL; returns the count.
+    """
+    deleted = (
+        db.query(models.IdempotencyKey)
+        .filter(models.IdempotencyKey.created_at < _now() - IDEMPOTENCY_TTL)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
+
+
+# =========================
+# ROUTE WRAPPER
+# =========================
+def _stored(result: Any, response_schema) -> Tuple[int, Any]:
+    if isinstance(result, Response):
+        return result.status_code, json.loads(result.body)
+
+    return status.HTTP_200_OK, jsonable_encoder(response_schema.from_orm(result))
+
+
+def _replay(stored: Dict[str, Any]) -> JSONResponse:
+    return JSONResponse(
+        status_code=stored["status_code"],
+        content=stored["content"],
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still in progress",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def run_idempotent(
+    db: Session,
+    user_id: int,
+    endpoint: str,
+    key: str,
+    body: Dict[str, Any],
+    handler: Callable[[], Awaitable[Any]],
+    response_schema,
+) -> Any:
+    """
+    Run `handler` at most once per (user, endpoint, key).
+    Its result (an ORM row for `response_schema`, or a Response)
+    is stored and replayed to retries.
+    """
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+        )
+
+    fingerprint = request_fingerprint(body)
+    ident = (user_id, endpoint, key)
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT
+
+    while True:
+        row_id, stored = await run_in_threadpool(
+            claim, db, user_id, endpoint, key, fingerprint
+        )
+        if stored is not None:
+            return _replay(stored)
+        if row_id is not None:
+            break
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _in_progress()
+
+        original = _inflight.get(ident)
+        if original is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(original), remaining)
+            except asyncio.TimeoutError:
+                raise _in_progress()
+        else:
+            # Original runs in another worker — poll its row
+            await asyncio.sleep(min(IDEMPOTENCY_POLL, remaining))
+
+    done = asyncio.get_running_loop().create_future()
+    _inflight[ident] = done
+
+    try:
+        result = await handler()
+        status_code, content = _stored(result, response_schema)
+        await run_in_threadpool(complete, db, row_id, status_code, content)
+        return result
+    except BaseException:
+        await run_in_threadpool(release, db, row_id)
+        raise
+    finally:
+        # Waiters re-claim: replay on success, take over on failure
+        _inflight.pop(ident, None)
+        done.set_result(None)
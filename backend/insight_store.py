@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import models
+
+# ======================================================
+# 🧠 AI INSIGHT MEMO (LONG-TERM MEMORY)
+# ======================================================
+# GET /workouts/insights serves the latest stored row while its
+# input fingerprint still matches; a new row is written only when
+# the inputs (or INSIGHTS_VERSION) change.
+
+# ⚠️ Bump when ai_insight_engine rules change
+INSIGHTS_VERSION = "v2"
+
+
+def latest_insight(
+    db: Session,
+    user_id: int,
+    source: str,
+) -> Optional[models.AIInsight]:
+    return (
+        db.query(models.AIInsight)
+        .filter(
+            models.AIInsight.user_id == user_id,
+            models.AIInsight.source == source,
+        )
+        .order_by(models.AIInsight.created_at.desc(), models.AIInsight.id.desc())
+        .first()
+    )
+
+
+def get_or_create_insight(
+    db: Session,
+    user_id: int,
+    source: str,
+    fingerprint: str,
+    compute: Callable[[], Dict],
+) -> Tuple[Dict, bool]:
+    """
+    Returns (insights, created).
+    """
+    latest = latest_insight(db, user_id, source)
+    if latest is not None and latest.fingerprint == fingerprint:
+        return latest.insights, False
+
+    insights = compute()
+
+    db.add(
+        models.AIInsight(
+            user_id=user_id,
+            source=source,
+            insights=insights,
+            fingerprint=fingerprint,
+        )
+    )
+    db.commit()
+
+    return insights, True
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MySQL DATETIME comes back naive
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def compact_ai_insights(
+    db: Session,
+    keep: int = 5,
+    max_age_days: Optional[int] = None,
+) -> int:
+    """
+    Keep the newest `keep` rows per (user, source); optionally
+    also drop anything older than `max_age_days` except each
+    pair's newest row. Returns the number of rows deleted.
+    """
+    cutoff = (
+        datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        if max_age_days is not None
+        else None
+    )
+
+    pairs = (
+        db.query(models.AIInsight.user_id, models.AIInsight.source)
+        .distinct()
+        .all()
+    )
+
+    deleted = 0
+
+    for user_id, source in pairs:
+        rows = (
+            db.query(models.AIInsight.id, models.AIInsight.created_at)
+            .filter(
+                models.AIInsight.user_id == user_id,
+                models.AIInsight.source == source,
+            )
+            .order_by(models.AIInsight.created_at.desc(), models.AIInsight.id.desc())
+            .all()
+        )
+
+        stale = [
+            row.id
+            for index, row in enumerate(rows)
+            if index >= keep
+            or (
+                index > 0
+                and cutoff is not None
+                and row.created_at is not None
+                and _as_utc(row.created_at) < cutoff
+            )
+        ]
+
+        for start in range(0, len(stale), 500):
+            batch = stale[start:start + 500]
+            db.query(models.AIInsight).filter(
+                models.AIInsight.id.in_(batch)
+            ).delete(synchronize_session=False)
+            deleted += len(batch)
+
+        db.commit()
+
+    return deleted
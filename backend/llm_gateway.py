@@ -0,0 +1,473 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from app.core import metrics
+from app.core.singleflight import llm_key, llm_singleflight
+
+# ======================================================
+# 🚦 LLM GATEWAY (SINGLE ENTRY POINT FOR OPENAI)
+# ======================================================
+# Every OpenAI call in the backend goes through here:
+# - single-flight for identical in-flight requests
+# - token buckets for requests/min and tokens/min
+# - max-concurrency cap
+# - jittered exponential retry on 429 / 5xx / network errors
+# A request that cannot be admitted within LLM_QUEUE_TIMEOUT
+# (or keeps failing) raises LLMUnavailable → HTTP 503.
+#
+# A completion cut off at max_tokens (finish_reason "length") is
+# retried once with the cap doubled (up to LLM_MAX_COMPLETION_TOKENS);
+# still cut off → LLMTruncated → HTTP 502, so a partial plan or
+# half a JSON object is never stored. Streams can't be retried
+# once chunks are out, so they raise LLMTruncated at the end.
+#
+# The `openai` SDK (~0.5s to import) and its clients are only
+# loaded on the first call, keeping worker start-up fast.
+
+load_dotenv()
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+LLM_RPM = int(os.getenv("LLM_RPM", 500))
+LLM_TPM = int(os.getenv("LLM_TPM", 200_000))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 32))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", 10))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 8))
+
+# Completion budget assumed when a call sets no max_tokens
+DEFAULT_COMPLETION_TOKENS = 800
+# Ceiling for the doubled cap on a truncation retry
+LLM_MAX_COMPLETION_TOKENS = int(os.getenv("LLM_MAX_COMPLETION_TOKENS", 4096))
+
+# =========================
+# LAZY CLIENTS
+# =========================
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def _client(kind: str):
+    """
+    Build the OpenAI / AsyncOpenAI client on first use.
+    """
+    existing = _clients.get(kind)
+    if existing is not None:
+        return existing
+
+    with _clients_lock:
+        if kind not in _clients:
+            if not OPENAI_API_KEY:
+                raise RuntimeError("OPENAI_API_KEY not found in .env file")
+
+            import openai
+
+            factory = openai.AsyncOpenAI if kind == "async" else openai.OpenAI
+            # Retries are owned by the gateway, not the SDK
+            _clients[kind] = factory(api_key=OPENAI_API_KEY, max_retries=0)
+
+        return _clients[kind]
+
+
+def _errors():
+    """
+    (retryable errors, APIStatusError) — resolved lazily with the SDK.
+    """
+    import openai
+
+    return (
+        (
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        ),
+        openai.APIStatusError,
+    )
+
+
+async def aclose() -> None:
+    """
+    Close whichever clients were built (app shutdown).
+    """
+    sync_client = _clients.pop("sync", None)
+    async_client = _clients.pop("async", None)
+
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.close()
+
+
+class LLMUnavailable(Exception):
+    """LLM capacity exhausted or upstream failing — surface as 503."""
+
+
+class LLMTruncated(Exception):
+    """Completion still hit max_tokens after a retry — surface as 502."""
+
+
+# =========================
+# LIMITER
+# =========================
+class TokenBucket:
+    """Refills continuously to `per_minute` capacity. Not locked itself."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+
+    def wait_for(self, n: float) -> float:
+        self._refill()
+        n = min(n, self.capacity)
+        if self.tokens >= n:
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+    def take(self, n: float) -> None:
+        self.tokens -= min(n, self.capacity)
+
+
+class Limiter:
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, est_tokens: int) -> float:
+        """0.0 = admitted, otherwise seconds to wait before retrying."""
+        with self._lock:
+            if self.in_flight >= self.max_concurrency:
+                return 0.05
+
+            wait = max(
+                self.requests.wait_for(1),
+                self.tokens.wait_for(est_tokens),
+            )
+            if wait > 0:
+                return wait
+
+            self.requests.take(1)
+            self.tokens.take(est_tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def has_headroom(self, max_load: float) -> bool:
+        """
+        True while under `max_load` (0-1) of the concurrency cap and
+        of both per-minute budgets — gate for low-priority work.
+        """
+        with self._lock:
+            self.requests._refill()
+            self.tokens._refill()
+            return (
+                self.in_flight < self.max_concurrency * max_load
+                and self.requests.tokens >= self.requests.capacity * (1 - max_load)
+                and self.tokens.tokens >= self.tokens.capacity * (1 - max_load)
+            )
+
+    def record_usage(self, est_tokens: int, actual_tokens: int) -> None:
+        # Settle the estimate against response.usage
+        with self._lock:
+            self.tokens.tokens = min(
+                self.tokens.capacity,
+                self.tokens.tokens + est_tokens - actual_tokens,
+            )
+
+    def acquire(self, est_tokens: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(est_tokens)
+            if wait == 0.0:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMUnavailable("AI service is busy. Please try again shortly.")
+            time.sleep(min(wait, remaining))
+
+    async def aacquire(self, est_tokens: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(est_tokens)
+            if wait == 0.0:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMUnavailable("AI service is busy. Please try again shortly.")
+            await asyncio.sleep(min(wait, remaining))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "requests_available": int(self.requests.tokens),
+                "tokens_available": int(self.tokens.tokens),
+            }
+
+
+limiter = Limiter(LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY)
+
+
+# =========================
+# HELPERS
+# =========================
+def _estimate_tokens(messages, max_tokens=None) -> int:
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _backoff(attempt: int) -> float:
+    delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.5)
+
+
+def _flight_key(params: dict) -> str:
+    return llm_key(
+        params["model"],
+        params.get("temperature"),
+        json.dumps(params, sort_keys=True, default=str),
+    )
+
+
+def _settle(est: int, model: str, usage) -> None:
+    if usage is not None:
+        limiter.record_usage(est, usage.total_tokens)
+        metrics.record_llm_usage(model, usage)
+
+
+def _observe(params: dict, outcome: str, start: float) -> None:
+    metrics.observe_llm(params["model"], outcome, time.perf_counter() - start)
+
+
+def _unavailable(error: Exception) -> LLMUnavailable:
+    return LLMUnavailable(f"AI service unavailable: {error}")
+
+
+def _truncated(response) -> bool:
+    choices = getattr(response, "choices", None)
+    return bool(choices) and choices[0].finish_reason == "length"
+
+
+def _incomplete(params: dict) -> LLMTruncated:
+    metrics.record_truncation(params["model"], "failed")
+    return LLMTruncated(
+        "AI response was cut off before it finished. Please try again."
+    )
+
+
+def _raised_cap(params: dict) -> dict:
+    """
+    Params for the one retry after a truncated completion.
+    """
+    cap = params.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+    retry_cap = min(cap * 2, LLM_MAX_COMPLETION_TOKENS)
+    if retry_cap <= cap:
+        raise _incomplete(params)
+
+    metrics.record_truncation(params["model"], "retried")
+    return {**params, "max_tokens": retry_cap}
+
+
+# =========================
+# SYNC
+# =========================
+def _chat_once(params: dict):
+    client = _client("sync")
+    retryable, status_error = _errors()
+    est = _estimate_tokens(params["messages"], params.get("max_tokens"))
+    last_error = None
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        with metrics.time_stage("llm_queue_wait"):
+            limiter.acquire(est, LLM_QUEUE_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            response = client.chat.completions.create(**params)
+        except retryable as e:
+            _observe(params, "retryable_error", start)
+            last_error = e
+        except status_error as e:
+            _observe(params, "error", start)
+            raise _unavailable(e) from e
+        else:
+            _observe(params, "ok", start)
+            _settle(est, params["model"], response.usage)
+            return response
+        finally:
+            limiter.release()
+
+        if attempt < LLM_MAX_RETRIES:
+            time.sleep(_backoff(attempt))
+
+    raise _unavailable(last_error) from last_error
+
+
+def _chat_flight(params: dict):
+    return llm_singleflight.do(
+        _flight_key(params), lambda: _chat_once(params)
+    )
+
+
+def chat(**params):
+    """
+    Drop-in for client.chat.completions.create (non-streaming).
+    """
+    response = _chat_flight(params)
+    if not _truncated(response):
+        return response
+
+    params = _raised_cap(params)
+    response = _chat_flight(params)
+    if _truncated(response):
+        raise _incomplete(params)
+    return response
+
+
+# =========================
+# ASYNC
+# =========================
+async def _achat_once(params: dict):
+    async_client = _client("async")
+    retryable, status_error = _errors()
+    est = _estimate_tokens(params["messages"], params.get("max_tokens"))
+    last_error = None
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        with metrics.time_stage("llm_queue_wait"):
+            await limiter.aacquire(est, LLM_QUEUE_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            response = await async_client.chat.completions.create(**params)
+        except retryable as e:
+            _observe(params, "retryable_error", start)
+            last_error = e
+        except status_error as e:
+            _observe(params, "error", start)
+            raise _unavailable(e) from e
+        else:
+            _observe(params, "ok", start)
+            _settle(est, params["model"], response.usage)
+            return response
+        finally:
+            limiter.release()
+
+        if attempt < LLM_MAX_RETRIES:
+            await asyncio.sleep(_backoff(attempt))
+
+    raise _unavailable(last_error) from last_error
+
+
+async def _achat_flight(params: dict):
+    return await llm_singleflight.ado(
+        _flight_key(params), lambda: _achat_once(params)
+    )
+
+
+async def achat(**params):
+    """
+    Async drop-in for async_client.chat.completions.create.
+    """
+    response = await _achat_flight(params)
+    if not _truncated(response):
+        return response
+
+    params = _raised_cap(params)
+    response = await _achat_flight(params)
+    if _truncated(response):
+        raise _incomplete(params)
+    return response
+
+
+async def astream(**params):
+    """
+    Yield content deltas. The concurrency slot is held for
+    the whole stream; retries only happen before the first chunk.
+    """
+    async_client = _client("async")
+    retryable, status_error = _errors()
+    est = _estimate_tokens(params["messages"], params.get("max_tokens"))
+    last_error = None
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        with metrics.time_stage("llm_queue_wait"):
+            await limiter.aacquire(est, LLM_QUEUE_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            stream = await async_client.chat.completions.create(
+                **params,
+                stream=True,
+                # final chunk carries usage (no choices)
+                stream_options={"include_usage": True},
+            )
+        except retryable as e:
+            _observe(params, "retryable_error", start)
+            limiter.release()
+            last_error = e
+        except status_error as e:
+            _observe(params, "error", start)
+            limiter.release()
+            raise _unavailable(e) from e
+        else:
+            break
+
+        if attempt < LLM_MAX_RETRIES:
+            await asyncio.sleep(_backoff(attempt))
+    else:
+        raise _unavailable(last_error) from last_error
+
+    outcome = "error"
+    finish_reason = None
+    try:
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                _settle(est, params["model"], chunk.usage)
+
+            if not chunk.choices:
+                continue
+
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            if choice.delta.content:
+                yield choice.delta.content
+        outcome = "ok"
+    except (GeneratorExit, asyncio.CancelledError):
+        outcome = "cancelled"  # client went away mid-stream
+        raise
+    finally:
+        # One sample for the whole stream, first byte to last
+        _observe(params, outcome, start)
+        limiter.release()
+
+    if finish_reason == "length":
+        raise _incomplete(params)
+
+
+def stats() -> dict:
+    return {
+        "limiter": limiter.stats(),
+        "singleflight": llm_singleflight.stats(),
+    }
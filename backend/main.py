@@ -1,14 +1,25 @@
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Literal, Optional, Union
+
 from fastapi import (
+    APIRouter,
     FastAPI,
     Depends,
     HTTPException,
     status,
     Form,
     Body,
+    Query,
+    Header,
 )
-from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 
 # =========================
 # LOCAL IMPORTS (PRESERVED)
@@ -16,107 +27,193 @@ from sqlalchemy.orm import Session
 import models
 import schemas
 import auth
-from database import SessionLocal, engine
-from email_service import send_contact_email
+import llm_gateway
+from database import (
+    ASYNC_DB_ENABLED,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_db,
+    get_pool_stats,
+)
+from email_outbox import email_sender, enqueue_contact_email, outbox_depth
+from idempotency import run_idempotent
+from tips_prefetch import tips_prefetcher
 from openai_service import (
-    generate_ai_workout,
-    generate_ai_diet,
+    agenerate_ai_workout,
+    agenerate_ai_diet,
+    astream_ai_workout,
+    astream_ai_diet,
 )
 
-# 🧠 AI MEMORY
-from app.core.workout_normalizer import normalize_workout_plan
-from app.core.ai_insight_engine import generate_ai_insights
-
-# =========================
-# APP INIT
-# =========================
-app = FastAPI(
-    title="AI Trainer Shahzad API",
-    version="1.0.0",
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    keyset_page,
+    listing_response,
 )
+from app.core.job_queue import JobQueue, QueueFull, store_from_env
+from app.core import metrics, tokens
+from app.core.responses import ORJSONResponse, add_compression
 
-# =========================
-# CORS (PRESERVED)
-# =========================
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:5174",
-        "http://localhost:5175",
-        "http://localhost:5176",
-        "http://localhost:5177",
-        "http://localhost:5178",
-        "http://localhost:5179",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:5174",
-        "http://127.0.0.1:5175",
-        "http://127.0.0.1:5176",
-        "http://127.0.0.1:5177",
-        "http://127.0.0.1:5178",
-        "http://127.0.0.1:5179",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# 🧠 AI MEMORY
+from exercise_store import (
+    attach_normalized_exercises,
+    exercise_dicts,
+    exercise_frequency,
+    workout_memory_item,
+)
+from insight_store import INSIGHTS_VERSION, get_or_create_insight
+from projections import (
+    project,
+    projection_options,
+    route_fields,
+)
+from app.core.cache import content_hash
+from app.core.ai_insight_engine import (
+    generate_ai_insights,
+    generate_ai_insights_from_counts,
 )
 
 # =========================
-# DATABASE
+# ROUTES
 # =========================
-models.Base.metadata.create_all(bind=engine)
+# Core routes live on a router; `create_app()` below assembles
+# the application (middleware, lifespan, routers).
+router = APIRouter()
 
 
-def get_db():
+def _persist(db: Session, obj):
+    """
+    Blocking insert — async routes call this via run_in_threadpool
+    so the event loop never waits on MySQL.
+    """
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def _persist_detached(obj):
+    """
+    Insert with a private session — streaming responses outlive
+    the request-scoped `get_db` session.
+    """
     db = SessionLocal()
     try:
-        yield db
+        _persist(db, obj)
+        return obj.id
     finally:
         db.close()
 
 # =========================
-# AUTH
+# SSE (STREAMED GENERATION)
 # =========================
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # disable nginx buffering
+}
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
-    payload = auth.verify_token(token)
+def _sse(data: dict, event: str = "message") -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-        )
 
-    user = (
-        db.query(models.User)
-        .filter(models.User.email == payload.get("sub"))
-        .first()
+def _stream_plan(chunks, build_record, on_stored=None):
+    """
+    Relay LLM chunks as SSE `message` events, then persist the
+    assembled text via `build_record(text)` and emit `done`.
+    `on_stored(record)` runs after the insert.
+    """
+
+    async def events():
+        parts = []
+
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield _sse({"delta": chunk})
+        except Exception as e:
+            yield _sse({"detail": str(e)}, event="error")
+            return
+
+        record = build_record("".join(parts).strip())
+        record_id = await run_in_threadpool(_persist_detached, record)
+        if on_stored is not None:
+            on_stored(record)
+
+        yield _sse({"id": record_id}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
 
-    if not user:
+# =========================
+# BACKGROUND JOBS (mode=async)
+# =========================
+job_queue = JobQueue(
+    store_from_env(),
+    workers=int(os.getenv("JOB_WORKERS", 4)),
+    maxsize=int(os.getenv("JOB_QUEUE_SIZE", 100)),
+)
+
+
+def _enqueue_generation(
+    kind, user_id, generate, build_record, response_schema, on_stored=None
+):
+    """
+    Queue generate → insert and answer 202 with the job id.
+    The job result is the same payload the sync route returns.
+    """
+
+    async def run():
+        # Worker tasks outlive the request — label token usage explicitly
+        with metrics.endpoint_label(f"job:{kind}"):
+            text = await generate()
+        record = build_record(text)
+        await run_in_threadpool(_persist_detached, record)
+        if on_stored is not None:
+            on_stored(record)
+        return jsonable_encoder(response_schema.from_orm(record))
+
+    try:
+        job = job_queue.submit(kind, user_id, run)
+    except QueueFull:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue is full. Please try again shortly.",
         )
 
-    return user
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job["id"], "status": job["status"]},
+    )
+
+# =========================
+# AUTH
+# =========================
+# Shared with the routers — one implementation, one user cache
+get_current_user = auth.get_current_user
+get_current_admin = auth.get_current_admin
 
 # =========================
 # AUTH ROUTES (UNCHANGED)
 # =========================
-@app.post("/signup")
-def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    if db.query(models.User).filter(models.User.email == user.email).first():
+def _user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+@router.post("/signup")
+async def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_user_by_email, db, user.email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user = models.User(
         email=user.email,
-        password=auth.hash_password(user.password),
+        password=await auth.ahash_password(user.password),
         first_name=user.first_name,
         last_name=user.last_name,
         username=user.username,
@@ -127,127 +224,297 @@ def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
         profile_image=user.profile_image,
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_persist, db, new_user)
 
     return {"message": "User created successfully"}
 
 
-@app.post("/login", response_model=schemas.Token)
-def login(
+@router.post("/login", response_model=schemas.Token)
+async def login(
     username: str = Form(...),
     password: str = Form(...),
     db: Session = Depends(get_db),
 ):
-    user = db.query(models.User).filter(models.User.email == username).first()
+    user = await run_in_threadpool(_user_by_email, db, username)
+
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    valid, new_hash = await auth.averify_password(password, user.password)
 
-    if not user or not auth.verify_password(password, user.password):
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    token = auth.create_access_token(data={"sub": user.email})
+    email = user.email
+
+    # BCRYPT_ROUNDS changed since this hash was made → upgrade it
+    if new_hash:
+        user.password = new_hash
+        await run_in_threadpool(db.commit)
+
+    token = auth.create_access_token(data={"sub": email})
 
     return {"access_token": token, "token_type": "bearer"}
 
 # =========================
 # PROFILE
 # =========================
-@app.get("/me", response_model=schemas.UserResponse)
+@router.get("/me", response_model=schemas.UserResponse)
 def get_profile(current_user: models.User = Depends(get_current_user)):
     return current_user
 
+# =========================
+# IDEMPOTENT GENERATION
+# =========================
+async def _generate_once(
+    idempotency_key, db, user_id, endpoint, body, generate, response_schema
+):
+    """
+    Plain `generate()` without an Idempotency-Key; with one, a
+    retry replays (or waits for) the first request's response.
+    """
+    if idempotency_key is None:
+        return await generate()
+
+    return await run_idempotent(
+        db, user_id, endpoint, idempotency_key, body, generate, response_schema
+    )
+
 # =========================
 # WORKOUT GENERATION
 # =========================
-@app.post("/workouts/generate", response_model=schemas.WorkoutResponse)
-def generate_workout(
+def _prefetch_tips(workout: models.Workout) -> None:
+    # Speculative: the first tips view for this workout is a cache hit
+    tips_prefetcher.schedule(workout.id, workout.workout_plan)
+
+
+def _new_workout(user_id: int, data: schemas.WorkoutCreate, text: str):
+    """
+    Workout row plus its normalized exercises (parsed once, here).
+    """
+    return attach_normalized_exercises(
+        models.Workout(
+            user_id=user_id,
+            **data.dict(),
+            workout_plan=text,
+        )
+    )
+
+
+@router.post("/workouts/generate", response_model=schemas.WorkoutResponse)
+async def generate_workout(
     data: schemas.WorkoutCreate,
+    mode: Literal["sync", "async"] = Query(default="sync"),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    workout_text = generate_ai_workout(data)
+    user_id = current_user.id
+
+    async def generate():
+        if mode == "async":
+            return _enqueue_generation(
+                "workout",
+                user_id,
+                lambda: agenerate_ai_workout(data),
+                lambda text: _new_workout(user_id, data, text),
+                schemas.WorkoutResponse,
+                on_stored=_prefetch_tips,
+            )
+
+        # Never hold a pooled connection across the LLM call
+        await run_in_threadpool(db.close)
+
+        workout_text = await agenerate_ai_workout(data)
+
+        workout = _new_workout(user_id, data, workout_text)
+
+        workout = await run_in_threadpool(_persist, db, workout)
+        _prefetch_tips(workout)
 
-    workout = models.Workout(
-        user_id=current_user.id,
-        **data.dict(),
-        workout_plan=workout_text,
+        return workout
+
+    return await _generate_once(
+        idempotency_key, db, user_id, "workouts/generate",
+        {"mode": mode, **data.dict()}, generate, schemas.WorkoutResponse,
     )
 
-    db.add(workout)
-    db.commit()
-    db.refresh(workout)
 
-    return workout
+@router.post("/workouts/generate/stream")
+async def generate_workout_stream(
+    data: schemas.WorkoutCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    user_id = current_user.id
+
+    # The auth lookup's session — never hold it across the stream
+    await run_in_threadpool(db.close)
+
+    return _stream_plan(
+        astream_ai_workout(data),
+        lambda text: _new_workout(user_id, data, text),
+        on_stored=_prefetch_tips,
+    )
 
 # =========================
 # 🧠 WORKOUT MEMORY
 # =========================
-@app.get("/workouts/memory")
+def _paginate(query, model, limit, cursor):
+    """
+    Keyset page when the client asked for one (limit/cursor),
+    otherwise the legacy full list.
+    Returns (rows, paginated, next_cursor).
+    """
+    if limit is None and cursor is None:
+        return query.order_by(model.created_at.desc()).all(), False, None
+
+    try:
+        rows, next_cursor = keyset_page(
+            query, model, limit or DEFAULT_PAGE_SIZE, cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return rows, True, next_cursor
+
+
+@router.get("/workouts/memory")
 def get_workouts_with_memory(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    view: Literal["full", "summary"] = Query(default="full"),
+    fields: Optional[str] = Query(default=None),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    workouts = (
-        db.query(models.Workout)
-        .filter(models.Workout.user_id == current_user.id)
-        .order_by(models.Workout.created_at.desc())
-        .all()
+    """
+    Pass `limit` (and then `cursor`) for a page:
+    {"items": [...], "next_cursor": str | null}.
+    Without them the full list is returned (legacy clients).
+
+    view=summary → id, created_at, name, fitness_goal only;
+    fields=a,b,c → any Workout columns / normalized_exercises.
+    Full plan: GET /workouts/{id}.
+    """
+    names = route_fields(models.Workout, view, fields)
+    query = db.query(models.Workout).filter(
+        models.Workout.user_id == current_user.id
+    )
+
+    if names is None:
+        query = query.options(selectinload(models.Workout.normalized_exercises))
+    else:
+        query = query.options(*projection_options(models.Workout, names))
+
+    workouts, paginated, next_cursor = _paginate(
+        query, models.Workout, limit, cursor
     )
 
-    return [
-        {
-            "id": w.id,
-            "created_at": w.created_at,
-            "name": w.name,
-            "fitness_goal": w.fitness_goal,
-            "workout_plan": w.workout_plan,
-            "normalized_exercises": normalize_workout_plan(w.workout_plan),
-        }
-        for w in workouts
-    ]
+    if names is None:
+        items = [workout_memory_item(w) for w in workouts]
+    else:
+        items = [project(w, names) for w in workouts]
+
+    return listing_response(items, paginated, next_cursor)
 
 # =========================
 # 🧠 AI INSIGHTS (SINGLE SOURCE OF TRUTH)
 # =========================
-@app.get("/workouts/insights")
+@router.get("/workouts/insights")
 def get_workout_insights(
+    window: Literal["last10", "7d", "30d", "90d"] = Query(default="last10"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    workouts = (
-        db.query(models.Workout)
-        .filter(models.Workout.user_id == current_user.id)
-        .order_by(models.Workout.created_at.desc())
-        .limit(10)
-        .all()
-    )
+    """
+    window=last10 → last 10 workouts (default)
+    window=7d|30d|90d → pre-aggregated user_exercise_stats
+    """
+    if window == "last10":
+        # Fingerprint = (workout id, stored exercise count) of the inputs
+        versions = (
+            db.query(
+                models.Workout.id,
+                func.count(models.NormalizedExercise.id),
+            )
+            .outerjoin(models.Workout.normalized_exercises)
+            .filter(models.Workout.user_id == current_user.id)
+            .group_by(models.Workout.id, models.Workout.created_at)
+            .order_by(models.Workout.created_at.desc())
+            .limit(10)
+            .all()
+        )
+        source = "workout"
+        fingerprint = content_hash(
+            INSIGHTS_VERSION,
+            source,
+            ",".join(f"{workout_id}:{count}" for workout_id, count in versions),
+        )
 
-    normalized_sets = [
-        normalize_workout_plan(w.workout_plan)
-        for w in workouts
-    ]
+        def compute():
+            workouts = (
+                db.query(models.Workout)
+                .options(selectinload(models.Workout.normalized_exercises))
+                .filter(models.Workout.id.in_([v[0] for v in versions]))
+                .all()
+            )
+            return generate_ai_insights([exercise_dicts(w) for w in workouts])
+    else:
+        frequency = exercise_frequency(db, current_user.id, int(window[:-1]))
+        source = f"workout:{window}"
+        fingerprint = content_hash(
+            INSIGHTS_VERSION,
+            source,
+            ",".join(f"{name}:{count}" for name, count in sorted(frequency.items())),
+        )
 
-    insights = generate_ai_insights(normalized_sets)
+        def compute():
+            return generate_ai_insights_from_counts(frequency)
 
-    # 🧠 SAVE LONG-TERM MEMORY
-    memory = models.AIInsight(
-        user_id=current_user.id,
-        source="workout",
-        insights=insights,
+    # 🧠 LONG-TERM MEMORY — written only when the inputs changed
+    insights, created = get_or_create_insight(
+        db, current_user.id, source, fingerprint, compute
     )
 
-    db.add(memory)
-    db.commit()
-
-    return {
+    return ORJSONResponse({
         "insights": insights,
         "saved": True,
+        "cached": not created,
+    })
+
+# =========================
+# WORKOUT DETAIL
+# =========================
+# Declared after /workouts/memory and /workouts/insights
+@router.get("/workouts/{workout_id}", response_model=schemas.WorkoutDetailResponse)
+def get_workout(
+    workout_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    workout = (
+        db.query(models.Workout)
+        .options(selectinload(models.Workout.normalized_exercises))
+        .filter(
+            models.Workout.id == workout_id,
+            models.Workout.user_id == current_user.id,
+        )
+        .first()
+    )
+
+    if not workout:
+        raise HTTPException(status_code=404, detail="Workout not found")
+
+    return {
+        **schemas.WorkoutResponse.from_orm(workout).dict(),
+        "normalized_exercises": exercise_dicts(workout),
     }
 
 # =========================
 # DELETE WORKOUT
 # =========================
-@app.delete("/workouts/{workout_id}")
+@router.delete("/workouts/{workout_id}")
 def delete_workout(
     workout_id: int,
     current_user: models.User = Depends(get_current_user),
@@ -267,58 +534,227 @@ def delete_workout(
 
     db.delete(workout)
     db.commit()
+    tips_prefetcher.cancel(workout_id)
 
     return {"message": "Workout deleted successfully"}
 
 # =========================
 # DIET (UNCHANGED)
 # =========================
-@app.post("/diet/generate", response_model=schemas.DietResponse)
-def generate_diet(
+@router.post("/diet/generate", response_model=schemas.DietResponse)
+async def generate_diet(
     data: schemas.DietCreate,
+    mode: Literal["sync", "async"] = Query(default="sync"),
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    diet_text = generate_ai_diet(data)
+    user_id = current_user.id
+
+    async def generate():
+        if mode == "async":
+            return _enqueue_generation(
+                "diet",
+                user_id,
+                lambda: agenerate_ai_diet(data),
+                lambda text: models.Diet(
+                    user_id=user_id,
+                    **data.dict(),
+                    diet_plan=text,
+                ),
+                schemas.DietResponse,
+            )
+
+        # Never hold a pooled connection across the LLM call
+        await run_in_threadpool(db.close)
+
+        diet_text = await agenerate_ai_diet(data)
+
+        diet = models.Diet(
+            user_id=user_id,
+            **data.dict(),
+            diet_plan=diet_text,
+        )
 
-    diet = models.Diet(
-        user_id=current_user.id,
-        **data.dict(),
-        diet_plan=diet_text,
+        return await run_in_threadpool(_persist, db, diet)
+
+    return await _generate_once(
+        idempotency_key, db, user_id, "diet/generate",
+        {"mode": mode, **data.dict()}, generate, schemas.DietResponse,
     )
 
-    db.add(diet)
-    db.commit()
-    db.refresh(diet)
 
-    return diet
+@router.post("/diet/generate/stream")
+async def generate_diet_stream(
+    data: schemas.DietCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    user_id = current_user.id
+
+    # The auth lookup's session — never hold it across the stream
+    await run_in_threadpool(db.close)
+
+    return _stream_plan(
+        astream_ai_diet(data),
+        lambda text: models.Diet(
+            user_id=user_id,
+            **data.dict(),
+            diet_plan=text,
+        ),
+    )
 
 
-@app.get("/diets", response_model=list[schemas.DietResponse])
+@router.get(
+    "/diets",
+    response_model=Union[list[schemas.DietResponse], schemas.DietPage],
+)
 def get_diets(
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    view: Literal["full", "summary"] = Query(default="full"),
+    fields: Optional[str] = Query(default=None),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    return (
+    """
+    Same paging and projection contract as /workouts/memory.
+    Projected rows are partial, so they bypass response_model.
+    Full plan: GET /diets/{id}.
+    """
+    names = route_fields(models.Diet, view, fields)
+    query = db.query(models.Diet).filter(models.Diet.user_id == current_user.id)
+
+    if names is not None:
+        query = query.options(*projection_options(models.Diet, names))
+
+    diets, paginated, next_cursor = _paginate(query, models.Diet, limit, cursor)
+
+    if names is not None:
+        return listing_response(
+            [project(d, names) for d in diets], paginated, next_cursor
+        )
+
+    if not paginated:
+        return diets
+
+    return {"items": diets, "next_cursor": next_cursor}
+
+
+@router.get("/diets/{diet_id}", response_model=schemas.DietResponse)
+def get_diet(
+    diet_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    diet = (
         db.query(models.Diet)
-        .filter(models.Diet.user_id == current_user.id)
-        .order_by(models.Diet.created_at.desc())
-        .all()
+        .filter(
+            models.Diet.id == diet_id,
+            models.Diet.user_id == current_user.id,
+        )
+        .first()
     )
 
+    if not diet:
+        raise HTTPException(status_code=404, detail="Diet not found")
+
+    return diet
+
+# =========================
+# 🔒 OPERATIONS STATS (ADMIN ONLY)
+# =========================
+# Prometheus (/metrics) carries the same numbers over time
+@router.get("/auth/cache-stats")
+def get_auth_cache_stats(
+    current_user: models.User = Depends(get_current_admin),
+):
+    return auth.user_cache.stats()
+
+
+@router.get("/db/stats")
+def get_db_stats(
+    current_user: models.User = Depends(get_current_admin),
+):
+    return get_pool_stats()
+
+
+@router.get("/jobs/stats")
+def get_job_stats(
+    current_user: models.User = Depends(get_current_admin),
+):
+    return job_queue.stats()
+
+
+@router.get("/llm/stats")
+def get_llm_stats(
+    current_user: models.User = Depends(get_current_admin),
+):
+    return llm_gateway.stats()
+
+
+@router.get("/email/stats")
+def get_email_stats(
+    current_user: models.User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    return {**email_sender.stats(), "outbox": outbox_depth(db)}
+
+# =========================
+# JOBS (ASYNC GENERATION STATUS)
+# =========================
+@router.get("/jobs/{job_id}")
+def get_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user),
+):
+    job = job_queue.get(job_id)
+
+    if not job or job["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return ORJSONResponse({
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+    })
+
+# =========================
+# 📈 PROMETHEUS
+# =========================
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(auth.require_metrics_access)],
+)
+def get_metrics():
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
+
 # =========================
 # CONTACT
 # =========================
-@app.post("/contact")
-def contact(
+@router.post("/contact", status_code=status.HTTP_202_ACCEPTED)
+async def contact(
     name: str = Body(...),
     email: str = Body(...),
     message: str = Body(...),
+    db: Session = Depends(get_db),
 ):
-    if not send_contact_email(name, email, message):
-        raise HTTPException(status_code=500, detail="Failed to send email")
+    """
+    Queued, not sent inline — the outbox sender delivers it
+    (with retries) over a reused SMTP session.
+    """
+    outbox_id = await run_in_threadpool(
+        enqueue_contact_email, db, name, email, message
+    )
+    email_sender.wake()
 
-    return {"message": "Message sent successfully"}
+    return {"message": "Message queued", "id": outbox_id}
 
 # =========================
 # EXTRA ROUTERS (PRESERVED)
@@ -326,5 +762,128 @@ def contact(
 import workout_tips
 import workout_tip_history
 
-app.include_router(workout_tips.router)
-app.include_router(workout_tip_history.router)
+# =========================
+# CORS (PRESERVED)
+# =========================
+CORS_ORIGINS = [
+    "http://localhost:5173",
+    "http://localhost:5174",
+    "http://localhost:5175",
+    "http://localhost:5176",
+    "http://localhost:5177",
+    "http://localhost:5178",
+    "http://localhost:5179",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:5174",
+    "http://127.0.0.1:5175",
+    "http://127.0.0.1:5176",
+    "http://127.0.0.1:5177",
+    "http://127.0.0.1:5178",
+    "http://127.0.0.1:5179",
+]
+
+# =========================
+# RESPONSE COMPRESSION
+# =========================
+# Below this many bytes compression costs more than it saves
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+
+# =========================
+# LIFESPAN
+# =========================
+# Schema is owned by Alembic (`alembic upgrade head`); nothing
+# touches the database at import or startup. DB_CREATE_ALL=1
+# restores create_all for throwaway SQLite dev/test databases.
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DB_CREATE_ALL:
+        await run_in_threadpool(models.Base.metadata.create_all, engine)
+
+    # Tips prompts are token-counted on the event loop (async routes)
+    await run_in_threadpool(tokens.preload_encodings, workout_tips.TIPS_MODEL)
+    auth.start_hash_pool()
+    job_queue.start()
+    email_sender.start()
+    tips_prefetcher.start()
+
+    yield
+
+    await tips_prefetcher.stop()
+    await job_queue.stop()
+    await email_sender.stop()
+    auth.shutdown_hash_pool()
+    await llm_gateway.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+# =========================
+# LLM CAPACITY → 503, CUT-OFF COMPLETION → 502
+# =========================
+async def llm_unavailable_handler(request, exc: llm_gateway.LLMUnavailable):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"},
+    )
+
+
+async def llm_truncated_handler(request, exc: llm_gateway.LLMTruncated):
+    return JSONResponse(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        content={"detail": str(exc)},
+    )
+
+# =========================
+# APP FACTORY
+# =========================
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="AI Trainer Shahzad API",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    app.add_exception_handler(llm_gateway.LLMUnavailable, llm_unavailable_handler)
+    app.add_exception_handler(llm_gateway.LLMTruncated, llm_truncated_handler)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    add_compression(app, COMPRESS_MIN_SIZE)
+
+    # Outermost, so latency includes compression and CORS
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    # Existing /…/stats payloads, also exported as gauges
+    metrics.register_stats("llm", llm_gateway.stats)
+    metrics.register_stats("auth_user_cache", auth.user_cache.stats)
+    metrics.register_stats("db_pool", get_pool_stats)
+    metrics.register_stats("jobs", job_queue.stats)
+    metrics.register_stats("email_sender", email_sender.stats)
+    metrics.register_stats("tips_cache", workout_tips.tips_cache_stats)
+    metrics.register_stats("tips_prefetch", tips_prefetcher.stats)
+
+    # Async read routes (opt-in) go first so they shadow the sync ones
+    if ASYNC_DB_ENABLED:
+        import async_routes
+
+        app.include_router(async_routes.router)
+
+    app.include_router(router)
+    app.include_router(workout_tips.router)
+    app.include_router(workout_tip_history.router)
+
+    return app
+
+
+app = create_app()
@@ -4,8 +4,11 @@ from sqlalchemy import (
     String,
     Text,
     ForeignKey,
+    Date,
     DateTime,
     JSON,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -38,6 +41,10 @@ class User(Base):
 # ======================================================
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        # keyset pagination: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_workouts_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -74,6 +81,7 @@ class Workout(Base):
         back_populates="workout",
         cascade="all, delete-orphan",
         passive_deletes=True,
+        order_by="NormalizedExercise.id",
     )
 
 
@@ -88,13 +96,15 @@ class NormalizedExercise(Base):
     workout_id = Column(
         Integer,
         ForeignKey("workouts.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True,
     )
 
     name = Column(String(255), nullable=False)
     sets = Column(Integer, nullable=True)
     reps = Column(String(50), nullable=True)
     rest = Column(String(50), nullable=True)
+    day = Column(Integer, nullable=True)
 
     # Relationship back to workout
     workout = relationship(
@@ -103,11 +113,46 @@ class NormalizedExercise(Base):
     )
 
 
+# ======================================================
+# 🧠 PER-USER EXERCISE FREQUENCY (INCREMENTAL AGGREGATE)
+# ======================================================
+# One row per (user, exercise, day). Maintained on workout
+# insert/delete by exercise_store; windowed insights sum the
+# rows for the last N days instead of re-reading plans.
+class UserExerciseStat(Base):
+    __tablename__ = "user_exercise_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "exercise_name", "day",
+            name="uq_user_exercise_stats_user_name_day",
+        ),
+        Index("ix_user_exercise_stats_user_id_day", "user_id", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # lower-cased, as counted by the insight engine
+    exercise_name = Column(String(255), nullable=False)
+    day = Column(Date, nullable=False)
+
+    count = Column(Integer, nullable=False, default=0)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+
+
 # ======================================================
 # DIET MODEL (UNCHANGED – SAFE)
 # ======================================================
 class Diet(Base):
     __tablename__ = "diets"
+    __table_args__ = (
+        Index("ix_diets_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -166,11 +211,36 @@ class WorkoutTipHistory(Base):
         DateTime(timezone=True),
         server_default=func.now()
     )
+# ======================================================
+# WORKOUT TIPS CACHE (CONTENT-ADDRESSED)
+# ======================================================
+class WorkoutTipsCache(Base):
+    __tablename__ = "workout_tips_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # sha256(prompt_version, model, workout_plan)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+
+    model = Column(String(50), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+
+    tips = Column(JSON, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+
+
 # ======================================================
 # 🧠 AI INSIGHTS (LONG-TERM MEMORY)
 # ======================================================
 class AIInsight(Base):
     __tablename__ = "ai_insights"
+    __table_args__ = (
+        Index("ix_ai_insights_user_id_source", "user_id", "source"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -186,7 +256,84 @@ class AIInsight(Base):
     # 🧠 Stored intelligence
     insights = Column(JSON, nullable=False)
 
+    # sha256 of the engine inputs — a new row only when it changes
+    fingerprint = Column(String(64), nullable=True)
+
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now()
     )
+
+
+# ======================================================
+# 📮 OUTBOUND EMAIL QUEUE (/contact)
+# ======================================================
+class OutboundEmail(Base):
+    __tablename__ = "outbound_emails"
+    __table_args__ = (
+        # sender poll: WHERE status IN (...) AND next_attempt_at <= now
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    kind = Column(String(20), nullable=False, default="contact")
+    payload = Column(JSON, nullable=False)
+
+    # pending → sending → sent | failed
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # when pending: earliest retry; when sending: claim lease expiry
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    claimed_by = Column(String(32), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# ======================================================
+# 🔑 IDEMPOTENCY KEYS (POST /workouts/generate, /diet/generate)
+# ======================================================
+# One row per (user, endpoint, Idempotency-Key). A retry with the
+# same key replays `response` instead of generating again.
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "endpoint", "key",
+            name="uq_idempotency_keys_user_endpoint_key",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    endpoint = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+
+    # SHA-256 of the request body — the same key with a different body is rejected
+    request_hash = Column(String(64), nullable=False)
+
+    # in_progress → completed (failed requests delete their row)
+    status = Column(String(20), nullable=False, default="in_progress")
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+
+    # when in_progress: lock lease start; a stale lease can be taken over
+    locked_at = Column(DateTime(timezone=True), nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        index=True
+    )
+    completed_at = Column(DateTime(timezone=True), nullable=True)
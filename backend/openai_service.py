@@ -1,109 +1,116 @@
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+
+import llm_gateway
+from app.core.fake_llm import fake_stream_completion
+from app.core.prompts import DIET_PLAN, WORKOUT_PLAN, PromptTemplate
+
+PLAN_MODEL = "gpt-4o-mini"
+PLAN_TEMPERATURE = 0.7
+
+# Completion caps (a 3-5 day workout / 7-day diet fits comfortably)
+WORKOUT_MAX_TOKENS = int(os.getenv("WORKOUT_MAX_TOKENS", 1200))
+DIET_MAX_TOKENS = int(os.getenv("DIET_MAX_TOKENS", 2000))
+
+# 🧪 Offline mode for the streaming endpoints (no OpenAI calls)
+USE_FAKE_LLM = os.getenv("AI_FAKE_LLM") == "1"
+
 
 # ======================================================
-# LOAD ENVIRONMENT VARIABLES
+# COMPLETION HELPERS (VIA LLM GATEWAY)
 # ======================================================
-load_dotenv()
+# Failures raise llm_gateway.LLMUnavailable (→ 503) instead of
+# returning an error string that would be stored as the plan.
+def _plan_params(template: PromptTemplate, data, max_tokens: int) -> dict:
+    # Static system prefix first, user data last → prompt-cache hits
+    return {
+        "model": PLAN_MODEL,
+        "messages": template.messages(**data.dict()),
+        "temperature": PLAN_TEMPERATURE,
+        "max_tokens": max_tokens,
+        "prompt_cache_key": template.id,
+    }
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not OPENAI_API_KEY:
-    raise RuntimeError("OPENAI_API_KEY not found in .env file")
+def _complete(params: dict) -> str:
+    response = llm_gateway.chat(**params)
+    return response.choices[0].message.content.strip()
 
-# Create OpenAI client (single instance)
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+async def _acomplete(params: dict) -> str:
+    response = await llm_gateway.achat(**params)
+    return response.choices[0].message.content.strip()
 
 
 # ======================================================
 # WORKOUT AI (OLD – FULLY PRESERVED)
 # ======================================================
+def workout_params(data) -> dict:
+    return _plan_params(WORKOUT_PLAN, data, WORKOUT_MAX_TOKENS)
+
+
 def generate_ai_workout(data):
     """
     Generates a personalized workout plan using OpenAI
     """
 
-    prompt = f"""
-Create a personalized workout plan.
+    return _complete(workout_params(data))
+
+
+# ======================================================
+# DIET AI (NEW – SAFE + MATCHES DB & SCHEMAS)
+# ======================================================
+def diet_params(data) -> dict:
+    return _plan_params(DIET_PLAN, data, DIET_MAX_TOKENS)
+
+
+def generate_ai_diet(data):
+    """
+    Generates a personalized diet plan using OpenAI
+    """
+
+    return _complete(diet_params(data))
 
-User Information:
-Name: {data.name}
-Age: {data.age}
-Weight: {data.weight} {data.weight_unit}
-Height: {data.height} {data.height_unit}
-Blood Group: {data.blood_group}
 
-Fitness Goal: {data.fitness_goal}
-Medical Condition: {data.medical_condition}
-Workout Preference: {data.workout_preference}
+# ======================================================
+# ASYNC VARIANTS (USED BY ASYNC ROUTES)
+# ======================================================
+async def agenerate_ai_workout(data):
+    """
+    Async version of generate_ai_workout (AsyncOpenAI)
+    """
 
-Instructions:
-- Create a 3 to 5 day workout plan
-- Include exercise name, sets, and reps
-- Keep it beginner friendly and safe
-- Add warm-up and cool-down advice
-- Simple, clean text format
-"""
+    return await _acomplete(workout_params(data))
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-        )
 
-        return response.choices[0].message.content.strip()
+async def agenerate_ai_diet(data):
+    """
+    Async version of generate_ai_diet (AsyncOpenAI)
+    """
 
-    except Exception as e:
-        # Never crash backend
-        return f"AI workout generation failed. Reason: {str(e)}"
+    return await _acomplete(diet_params(data))
 
 
 # ======================================================
-# DIET AI (NEW – SAFE + MATCHES DB & SCHEMAS)
+# STREAMING (SSE ROUTES)
 # ======================================================
-def generate_ai_diet(data):
+async def astream_completion(params: dict):
     """
-    Generates a personalized diet plan using OpenAI
+    Yield completion text chunks as OpenAI emits them.
+    Errors propagate — the SSE route reports them to the client.
     """
 
-    prompt = f"""
-Create a personalized diet plan.
-
-User Information:
-Name: {data.name}
-Age: {data.age}
-Weight: {data.weight} {data.weight_unit}
-Height: {data.height} {data.height_unit}
-Blood Group: {data.blood_group}
-
-Fitness Goal: {data.fitness_goal}
-Medical Condition: {data.medical_condition}
-Diet Preference: {data.diet_preference}
-
-Instructions:
-- Create a 7-day diet plan
-- Include breakfast, lunch, dinner, and snacks
-- Mention portion sizes
-- Add hydration tips
-- Keep it healthy, realistic, and beginner friendly
-- Simple, clean text format
-"""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-        )
-
-        return response.choices[0].message.content.strip()
-
-    except Exception as e:
-        # Never crash backend
-        return f"AI diet generation failed. Reason: {str(e)}"
+    if USE_FAKE_LLM:
+        async for chunk in fake_stream_completion(params["messages"]):
+            yield chunk
+        return
+
+    async for chunk in llm_gateway.astream(**params):
+        yield chunk
+
+
+def astream_ai_workout(data):
+    return astream_completion(workout_params(data))
+
+
+def astream_ai_diet(data):
+    return astream_completion(diet_params(data))
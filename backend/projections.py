@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import load_only, selectinload
+
+import models
+from exercise_store import exercise_dicts
+
+# ======================================================
+# 🔍 FIELD PROJECTION FOR HISTORY LISTS
+# ======================================================
+# ?view=summary or ?fields=a,b,c on /workouts/memory and /diets.
+# Only the requested columns are SELECTed (load_only), so the
+# multi-KB plan Text columns stay in MySQL unless asked for.
+# Full plans come from the detail endpoints.
+
+EXERCISES = "normalized_exercises"
+
+# Always included — the keyset cursor is built from them
+_REQUIRED = ("id", "created_at")
+
+SUMMARY_FIELDS = {
+    models.Workout: ("name", "fitness_goal"),
+    models.Diet: ("name", "fitness_goal", "diet_preference"),
+}
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def _allowed(model) -> set:
+    allowed = {column.key for column in model.__table__.columns}
+    if model is models.Workout:
+        allowed.add(EXERCISES)
+    return allowed
+
+
+def requested_fields(model, view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Field names to return, or None for the full (legacy) rows.
+    `fields` wins over `view`.
+    """
+    if fields is None and view != "summary":
+        return None
+
+    if fields is not None:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+    else:
+        names = list(SUMMARY_FIELDS[model])
+
+    unknown = sorted(set(names) - _allowed(model))
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+
+    return list(dict.fromkeys([*_REQUIRED, *names]))
+
+
+def route_fields(model, view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """
+    `requested_fields` for the sync and async list routes:
+    unknown fields → 400.
+    """
+    try:
+        return requested_fields(model, view, fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def projection_options(model, names: List[str]) -> list:
+    """
+    Loader options that fetch just `names` (Query or select()).
+    """
+    options = [
+        load_only(*(getattr(model, name) for name in names if name != EXERCISES))
+    ]
+
+    if EXERCISES in names:
+        options.append(selectinload(models.Workout.normalized_exercises))
+
+    return options
+
+
+def project(row, names: List[str]) -> Dict:
+    return {
+        name: (
+            # Stored rows only: parsing would need the unloaded plan
+            exercise_dicts(row, parse_fallback="workout_plan" in names)
+            if name == EXERCISES
+            else getattr(row, name)
+        )
+        for name in names
+    }
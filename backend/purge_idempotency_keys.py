@@ -0,0 +1,29 @@
+"""
+Retention for idempotency_keys.
+
+Rows are only needed while clients may still retry; anything
+older than IDEMPOTENCY_TTL_HOURS (default 24) is deleted.
+
+Usage:
+    python purge_idempotency_keys.py
+"""
+import argparse
+
+from database import SessionLocal
+from idempotency import purge_expired_keys
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__).parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_keys(db)
+    finally:
+        db.close()
+
+    print(f"Deleted {deleted} idempotency_keys rows")
+
+
+if __name__ == "__main__":
+    main()
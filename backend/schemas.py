@@ -127,10 +127,14 @@ class WorkoutHistoryResponse(ORMBaseModel):
 # WORKOUT TIPS (GENERATION RESPONSE)
 # ======================================================
 
-class WorkoutTipsGenerateResponse(ORMBaseModel):
+class WorkoutTips(ORMBaseModel):
+    # Also the structured-output schema sent to OpenAI
     warmup: List[str]
     workout: List[str]
     recovery: List[str]
+
+
+class WorkoutTipsGenerateResponse(WorkoutTips):
     created_at: datetime
 
 # ======================================================
@@ -201,6 +205,11 @@ class DietResponse(ORMBaseModel):
     diet_plan: Optional[str]
     created_at: datetime
 
+
+class DietPage(BaseModel):
+    items: List[DietResponse]
+    next_cursor: Optional[str] = None
+
 # ======================================================
 # CONTACT FORM
 # ======================================================
@@ -219,10 +228,16 @@ class ExerciseBlock(BaseModel):
     sets: Optional[int] = None
     reps: Optional[str] = None
     rest: Optional[str] = None
+    day: Optional[int] = None
 
 
 class NormalizedWorkout(BaseModel):
     exercises: List[ExerciseBlock]
+
+
+class WorkoutDetailResponse(WorkoutResponse):
+    normalized_exercises: List[ExerciseBlock] = Field(default_factory=list)
+
 # ======================================================
 # 🧠 AI INSIGHTS RESPONSE
 # ======================================================
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import uuid
+
+# Configure before any app module is imported: settings are read
+# at import time. Throwaway SQLite file shared by the sync and
+# aiosqlite engines; the fake LLM stands in for OpenAI and no
+# OPENAI_API_KEY is set, so an accidental real call fails fast.
+# The app's outbox sender only drains at startup; tests drive
+# their own EmailSender.
+_DB = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_DB}",
+    ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{_DB}",
+    DB_CREATE_ALL="1",
+    AI_FAKE_LLM="1",
+    TIPS_PREFETCH="0",
+    EMAIL_POLL_INTERVAL="3600",
+)
+os.environ.pop("OPENAI_API_KEY", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    import main
+
+    return main.app
+
+
+@pytest.fixture
+def client(app):
+    import models
+    from database import engine
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    with engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture
+def db(client):
+    from database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    import models
+
+    row = models.User(
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        password="not-a-real-hash",
+        first_name="Test",
+        last_name="User",
+        username=uuid.uuid4().hex[:12],
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+@pytest.fixture
+def auth_headers(user):
+    import auth
+
+    token = auth.create_access_token({"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+WORKOUT_BODY = dict(
+    name="Test",
+    age=30,
+    weight=80,
+    weight_unit="kg",
+    height=180,
+    height_unit="cm",
+    blood_group="O+",
+    fitness_goal="muscle gain",
+    medical_condition="none",
+    workout_preference="gym",
+)
+
+DIET_BODY = dict(WORKOUT_BODY, diet_preference="balanced")
+del DIET_BODY["workout_preference"]
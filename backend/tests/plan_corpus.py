@@ -0,0 +1,108 @@
+# Plans in the shapes gpt-4o-mini actually returns for
+# /workouts/generate (markdown, numbered lists, "x" notation,
+# table rows, weekday headers). Shared by the normalizer tests
+# and bench_normalizer.py.
+
+MARKDOWN_SETS_OF = """Here's a beginner-friendly 3-day workout plan for you!
+
+### Day 1: Upper Body
+**Warm-up:** 5-10 minutes of light cardio (jumping jacks, arm circles)
+
+1. **Push-Ups**: 3 sets of 10-12 reps
+2. **Dumbbell Rows**: 3 sets of 12 reps (each arm)
+3. **Plank**: 3 sets of 30 seconds
+4. **Side Plank**: 3 sets of 20 (10 each side)
+
+**Cool-down:** Stretch your chest and shoulders for 5 minutes.
+
+### Day 2: Lower Body
+1. **Bodyweight Squats**: 3 sets of 15 reps
+2. **Lunges**: 3 sets of 10 reps per leg
+3. **Glute Bridges**: 3 sets of 15 reps
+
+### Day 3: Full Body
+1. **Burpees**: 3 sets of 8 reps
+2. **Mountain Climbers**: 3 sets of 20 (10 each leg)
+
+Rest 60 seconds between sets. Stay hydrated and listen to your body!
+"""
+
+X_NOTATION = """Day 1 - Full Body
+- Goblet Squat: 3x12, rest 60s
+- Bench Press 4 x 8-10 (rest 90 seconds)
+- Bent-over row — 3 × 10
+- Mountain climbers 3 rounds of 20
+- 3 sets of 15 squats
+
+Day 2 - Cardio & Core
+- Burpees: 4 sets x 10 reps, 45 sec rest
+- Russian twists 3 x 20
+- Wall sit: 3 x 45 seconds
+"""
+
+TABLE_WEEKDAYS = """Monday – Chest & Triceps
+Bench Press | Sets: 4 | Reps: 6-8
+Tricep Dips | Sets: 3 | Reps: 12
+
+Wednesday – Back & Biceps
+Lat Pulldown | Sets: 4 | Reps: 10
+Bicep Curls | Sets: 3 | Reps: 12
+
+Friday – Legs
+Leg Press | Sets: 4 | Reps: 10
+Calf Raises | Sets: 3 | Reps: 15
+"""
+
+MIXED_HEADERS = """Day 1: Upper Body
+Push-ups: 3 x 10
+Tuesday: Active recovery, walk for 20 minutes
+Day 2: Lower Body
+Squats: 3 x 15
+Thursday - Core
+Plank: 3 x 30 sec
+"""
+
+PLANS = {
+    "markdown_sets_of": MARKDOWN_SETS_OF,
+    "x_notation": X_NOTATION,
+    "table_weekdays": TABLE_WEEKDAYS,
+    "mixed_headers": MIXED_HEADERS,
+}
+
+# (name, sets, reps, rest, day) per plan
+EXPECTED = {
+    "markdown_sets_of": [
+        ("Push-Up", 3, "10-12", None, 1),
+        ("Dumbbell Row", 3, "12", None, 1),
+        ("Plank", 3, "30 sec", None, 1),
+        ("Side Plank", 3, "20", None, 1),
+        ("Bodyweight Squat", 3, "15", None, 2),
+        ("Lunge", 3, "10", None, 2),
+        ("Glute Bridge", 3, "15", None, 2),
+        ("Burpee", 3, "8", None, 3),
+        ("Mountain Climber", 3, "20", None, 3),
+    ],
+    "x_notation": [
+        ("Goblet Squat", 3, "12", "60 sec", 1),
+        ("Bench Press", 4, "8-10", "90 sec", 1),
+        ("Bent-Over Row", 3, "10", None, 1),
+        ("Mountain Climber", 3, "20", None, 1),
+        ("Squat", 3, "15", None, 1),
+        ("Burpee", 4, "10", "45 sec", 2),
+        ("Russian Twist", 3, "20", None, 2),
+        ("Wall Sit", 3, "45 sec", None, 2),
+    ],
+    "table_weekdays": [
+        ("Bench Press", 4, "6-8", None, 1),
+        ("Tricep Dip", 3, "12", None, 1),
+        ("Lat Pulldown", 4, "10", None, 2),
+        ("Bicep Curl", 3, "12", None, 2),
+        ("Leg Press", 4, "10", None, 3),
+        ("Calf Raise", 3, "15", None, 3),
+    ],
+    "mixed_headers": [
+        ("Push-Up", 3, "10", None, 1),
+        ("Squat", 3, "15", None, 2),
+        ("Plank", 3, "30 sec", None, 3),
+    ],
+}
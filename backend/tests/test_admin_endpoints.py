@@ -0,0 +1,47 @@
+import pytest
+
+import auth
+import models
+
+STATS = ["/auth/cache-stats", "/db/stats", "/jobs/stats", "/llm/stats", "/email/stats"]
+
+
+@pytest.fixture
+def admin_headers(db, user):
+    db.query(models.User).filter_by(id=user.id).update({"role": auth.ADMIN_ROLE})
+    db.commit()
+    auth.invalidate_cached_user(user.email)
+
+    token = auth.create_access_token({"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("path", STATS)
+def test_stats_require_admin(client, auth_headers, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=auth_headers).status_code == 403
+
+
+@pytest.mark.parametrize("path", STATS)
+def test_stats_for_admin(client, admin_headers, path):
+    assert client.get(path, headers=admin_headers).status_code == 200
+
+
+def test_metrics_requires_admin_or_token(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(auth, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=auth_headers).status_code == 403
+    assert client.get(
+        "/metrics", headers={"Authorization": "Bearer wrong"}
+    ).status_code == 401
+
+    scraped = client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert scraped.status_code == 200
+    assert "http_request_duration_seconds" in scraped.text
+
+
+def test_metrics_for_admin(client, admin_headers):
+    assert client.get("/metrics", headers=admin_headers).status_code == 200
@@ -0,0 +1,130 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import database
+import llm_gateway
+import models
+from exercise_store import attach_normalized_exercises
+
+from conftest import DIET_BODY, WORKOUT_BODY
+
+TIPS = {
+    "warmup": ["Five minutes of brisk walking"],
+    "workout": ["Brace your core on every rep"],
+    "recovery": ["Stretch your quads"],
+}
+
+
+@pytest.fixture(autouse=True)
+def _async_engine():
+    # conftest sets ASYNC_DATABASE_URL, so main.py mounts async_routes
+    # ahead of the sync handlers for the same paths
+    assert database.ASYNC_DB_ENABLED
+
+
+def _workout(db, user, plan="Squats: 3 x 5\nPlank: 3 x 30 sec"):
+    row = attach_normalized_exercises(
+        models.Workout(**WORKOUT_BODY, user_id=user.id, workout_plan=plan)
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def _fake_achat(calls):
+    async def achat(**params):
+        calls.append(params)
+        message = SimpleNamespace(content=json.dumps(TIPS), refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    return achat
+
+
+def test_me(client, user, auth_headers):
+    response = client.get("/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+
+
+def test_workout_memory_full_view(client, db, user, auth_headers):
+    workout = _workout(db, user)
+
+    response = client.get("/workouts/memory", headers=auth_headers)
+
+    assert response.status_code == 200
+    (item,) = response.json()
+    assert item["id"] == workout.id
+    assert [ex["name"] for ex in item["normalized_exercises"]] == ["Squat", "Plank"]
+
+
+def test_workout_memory_fields_and_pages(client, db, user, auth_headers):
+    ids = sorted((_workout(db, user).id for _ in range(3)), reverse=True)
+
+    first = client.get(
+        "/workouts/memory",
+        params={"limit": 2, "fields": "id,name"},
+        headers=auth_headers,
+    ).json()
+    second = client.get(
+        "/workouts/memory",
+        params={"limit": 2, "fields": "id,name", "cursor": first["next_cursor"]},
+        headers=auth_headers,
+    ).json()
+
+    assert set(first["items"][0]) == {"id", "created_at", "name"}
+    assert [w["id"] for w in first["items"] + second["items"]] == ids
+    assert second["next_cursor"] is None
+
+
+def test_workout_memory_rejects_unknown_fields(client, auth_headers):
+    response = client.get(
+        "/workouts/memory", params={"fields": "password"}, headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_diets_list_and_page(client, db, user, auth_headers):
+    for _ in range(2):
+        db.add(models.Diet(**DIET_BODY, user_id=user.id, diet_plan="Oats"))
+    db.commit()
+
+    listed = client.get("/diets", headers=auth_headers)
+    page = client.get("/diets", params={"limit": 1}, headers=auth_headers)
+
+    assert listed.status_code == 200
+    assert len(listed.json()) == 2
+    assert len(page.json()["items"]) == 1
+    assert page.json()["next_cursor"]
+
+
+def test_workout_tips_generated_once_then_cached(
+    client, db, user, auth_headers, monkeypatch
+):
+    calls = []
+    monkeypatch.setattr(llm_gateway, "achat", _fake_achat(calls))
+    workout = _workout(db, user, plan=f"Lunges: 3 x 10\nUser {user.id}")
+
+    first = client.get(f"/workout-tips/{workout.id}", headers=auth_headers)
+    second = client.get(f"/workout-tips/{workout.id}", headers=auth_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert {k: first.json()[k] for k in TIPS} == TIPS
+    assert {k: second.json()[k] for k in TIPS} == TIPS
+    assert len(calls) == 1
+
+
+def test_workout_tips_other_users_workout_is_404(client, db, auth_headers):
+    other = models.User(
+        email="other@example.com", password="x", username="other-user"
+    )
+    db.add(other)
+    db.commit()
+    workout = _workout(db, other)
+
+    response = client.get(f"/workout-tips/{workout.id}", headers=auth_headers)
+
+    assert response.status_code == 404
@@ -0,0 +1,43 @@
+import asyncio
+
+import auth
+
+
+def test_signup_then_login(client):
+    body = {
+        "email": "new@example.com",
+        "password": "correct horse",
+        "first_name": "New",
+        "last_name": "User",
+        "username": "newuser",
+    }
+    assert client.post("/signup", json=body).status_code == 200
+
+    ok = client.post(
+        "/login", data={"username": body["email"], "password": body["password"]}
+    )
+    bad = client.post(
+        "/login", data={"username": body["email"], "password": "wrong"}
+    )
+
+    assert ok.status_code == 200 and ok.json()["access_token"]
+    assert bad.status_code == 400
+
+
+def test_hash_pool_survives_a_restart(monkeypatch):
+    # One slot → the other callers wait on the semaphore, which
+    # binds it to the running loop
+    monkeypatch.setattr(auth, "HASH_QUEUE_SIZE", 1)
+
+    async def run():
+        auth.start_hash_pool()
+        try:
+            return await asyncio.gather(
+                *(auth._run_in_hash_pool(abs, -i) for i in range(3))
+            )
+        finally:
+            auth.shutdown_hash_pool()
+
+    # A second asyncio.run is a new loop, like a --reload restart
+    for _ in range(2):
+        assert asyncio.run(run()) == [0, 1, 2]
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from aiosmtpd.controller import Controller
+
+import models
+from email_outbox import (
+    EMAIL_BACKOFF_BASE,
+    EMAIL_MAX_ATTEMPTS,
+    FAILED,
+    PENDING,
+    SENT,
+    EmailSender,
+    enqueue_contact_email,
+)
+from app.core import metrics
+
+
+class FakeConnection:
+    """Stands in for SMTPConnection; `outcomes` are exceptions or None."""
+
+    def __init__(self, *outcomes, drops_session=False):
+        self.outcomes = list(outcomes)
+        self.drops_session = drops_session
+        self.connected = True
+        self.sent = []
+
+    def send(self, msg):
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if outcome is not None:
+            if self.drops_session:
+                self.connected = False
+            raise outcome
+        self.sent.append(msg)
+
+    def close(self):
+        self.connected = False
+
+
+def _enqueue(db, count=1):
+    return [
+        enqueue_contact_email(db, "Ann", "ann@example.com", f"hello {i}")
+        for i in range(count)
+    ]
+
+
+def _row(db, row_id):
+    db.expire_all()
+    return db.get(models.OutboundEmail, row_id)
+
+
+def _seconds_until(when):
+    if when.tzinfo is None:  # SQLite hands back naive UTC
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
+def test_sends_and_marks_sent(db):
+    (row_id,) = _enqueue(db)
+    connection = FakeConnection()
+    sender = EmailSender(connection=connection)
+
+    assert sender.drain_once() == 1
+
+    row = _row(db, row_id)
+    assert row.status == SENT
+    assert row.attempts == 1
+    assert row.sent_at is not None and row.last_error is None
+    assert len(connection.sent) == 1
+    assert sender.stats()["sent"] == 1
+
+
+def test_failed_send_is_retried_with_backoff(db):
+    (row_id,) = _enqueue(db)
+    sender = EmailSender(connection=FakeConnection(RuntimeError("mailbox full")))
+
+    sender.drain_once()
+
+    row = _row(db, row_id)
+    assert row.status == PENDING
+    assert row.attempts == 1
+    assert row.last_error == "RuntimeError: mailbox full"
+    wait = _seconds_until(row.next_attempt_at)
+    assert EMAIL_BACKOFF_BASE * 0.5 - 1 <= wait <= EMAIL_BACKOFF_BASE * 1.5
+    # Not due yet
+    assert sender.drain_once() == 0
+
+
+def test_last_attempt_marks_failed(db):
+    (row_id,) = _enqueue(db)
+    row = _row(db, row_id)
+    row.attempts = EMAIL_MAX_ATTEMPTS - 1
+    db.commit()
+    sender = EmailSender(connection=FakeConnection(RuntimeError("rejected")))
+
+    sender.drain_once()
+
+    row = _row(db, row_id)
+    assert row.status == FAILED
+    assert row.attempts == EMAIL_MAX_ATTEMPTS
+    assert sender.stats()["failed"] == 1
+
+
+def test_dropped_session_releases_rest_of_batch_uncharged(db):
+    first, *rest = _enqueue(db, 3)
+    connection = FakeConnection(ConnectionError("gone"), drops_session=True)
+    sender = EmailSender(connection=connection)
+
+    assert sender.drain_once() == 3
+
+    assert _row(db, first).attempts == 1
+    for row_id in rest:
+        row = _row(db, row_id)
+        assert row.status == PENDING
+        assert row.attempts == 0
+        assert row.claimed_by is None
+        assert _seconds_until(row.next_attempt_at) > 0
+    assert connection.sent == []
+
+
+def test_drain_error_is_logged_and_counted(caplog):
+    def broken_session():
+        raise RuntimeError("db down")
+
+    sender = EmailSender(
+        session_factory=broken_session,
+        connection=FakeConnection(),
+        poll_interval=0.01,
+    )
+    before = metrics.BACKGROUND_FAILURES.labels("email_outbox")._value.get()
+
+    async def run():
+        sender.start()
+        await asyncio.sleep(0.05)
+        await sender.stop()
+
+    with caplog.at_level(logging.ERROR, logger="email_outbox"):
+        asyncio.run(run())
+
+    assert sender.stats()["errors"] >= 1
+    assert "email outbox drain failed" in caplog.text
+    assert metrics.BACKGROUND_FAILURES.labels("email_outbox")._value.get() > before
+
+
+# =========================
+# REAL SMTPConnection vs aiosmtpd
+# =========================
+class RecordingHandler:
+    """Records (session id, subject) per message and each live session."""
+
+    def __init__(self):
+        self.messages = []
+        self.servers = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        self.servers.append(server)
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        subject = envelope.content.decode().split("Subject: ", 1)[1].split("\n")[0]
+        self.messages.append((id(session), subject.strip()))
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    import email_service
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    monkeypatch.setattr(email_service, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(email_service, "SMTP_PORT", port)
+    monkeypatch.setattr(email_service, "SMTP_EMAIL", "coach@example.com")
+    monkeypatch.setattr(email_service, "SMTP_PASSWORD", None)
+    monkeypatch.setattr(email_service, "SMTP_STARTTLS", False)
+
+    yield SimpleNamespace(handler=handler, controller=controller)
+    controller.stop()
+
+
+def _message(name):
+    from email_service import build_contact_message
+
+    return build_contact_message(name, "ann@example.com", "hi")
+
+
+def _sessions(handler):
+    return len({session for session, _ in handler.messages})
+
+
+def test_smtp_session_is_reused(smtp_server, db):
+    from email_service import SMTPConnection
+
+    _enqueue(db, 3)
+    connection = SMTPConnection()
+    sender = EmailSender(connection=connection)
+
+    assert sender.drain_once() == 3
+
+    handler = smtp_server.handler
+    assert len(handler.messages) == 3
+    assert _sessions(handler) == 1
+    assert connection.connected
+    connection.close()
+
+
+def test_smtp_session_closes_after_idle_timeout(smtp_server, monkeypatch):
+    import email_service
+
+    monkeypatch.setattr(email_service, "SMTP_IDLE_TIMEOUT", 0)
+    connection = email_service.SMTPConnection()
+
+    connection.send(_message("first"))
+    time.sleep(0.01)
+    connection.send(_message("second"))
+    connection.close()
+
+    assert _sessions(smtp_server.handler) == 2
+
+
+def test_smtp_reconnects_after_server_disconnect(smtp_server, db):
+    from email_service import SMTPConnection
+
+    connection = SMTPConnection()
+    connection.send(_message("before"))
+
+    # The server drops the idle session
+    (server,) = smtp_server.handler.servers
+    smtp_server.controller.loop.call_soon_threadsafe(server.transport.close)
+    time.sleep(0.05)
+
+    _enqueue(db, 2)
+    sender = EmailSender(connection=connection)
+    assert sender.drain_once() == 2
+    connection.close()
+
+    handler = smtp_server.handler
+    assert [subject for _, subject in handler.messages] == [
+        "New Contact Message from before",
+        "New Contact Message from Ann",
+        "New Contact Message from Ann",
+    ]
+    assert _sessions(handler) == 2
+    db.expire_all()
+    assert {row.status for row in db.query(models.OutboundEmail)} == {SENT}
@@ -0,0 +1,130 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+
+import exercise_store
+import models
+from exercise_store import attach_normalized_exercises, rebuild_exercise_stats
+
+
+def _stats(db, user):
+    return sorted(
+        (row.exercise_name, row.day, row.count)
+        for row in db.query(models.UserExerciseStat).filter_by(user_id=user.id)
+    )
+
+
+def _store(db, user, plan):
+    workout = attach_normalized_exercises(
+        models.Workout(user_id=user.id, name="w", workout_plan=plan)
+    )
+    db.add(workout)
+    db.commit()
+    return workout
+
+
+def test_insert_delete_and_rebuild_use_the_stored_day(db, user):
+    workout = _store(db, user, "Squats 3x5\nPlank: 3 x 30 sec")
+    db.expire_all()
+    day = workout.created_at.date()
+
+    stats = _stats(db, user)
+    assert stats == [("plank", day, 1), ("squat", day, 1)]
+
+    rebuild_exercise_stats(db)
+    assert _stats(db, user) == stats
+
+    db.delete(workout)
+    db.commit()
+    assert _stats(db, user) == []
+
+
+def test_created_at_is_left_to_the_db_and_sets_the_day(db, user):
+    inserts = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO workouts"):
+            inserts.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", before)
+    try:
+        _store(db, user, "Squats 3x5")
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", before)
+
+    # Not stamped by the app: the server-side now() default writes it,
+    # as for older workouts and diets
+    assert inserts and "created_at" not in inserts[0].split("VALUES")[0]
+    db.query(models.Workout).delete()
+    db.query(models.UserExerciseStat).delete()
+
+    late = attach_normalized_exercises(models.Workout(
+        user_id=user.id, name="w", workout_plan="Squats 3x5",
+        created_at=datetime(2026, 3, 1, 23, 30),
+    ))
+    db.add(late)
+    db.commit()
+
+    assert _stats(db, user) == [("squat", date(2026, 3, 1), 1)]
+
+
+@pytest.fixture
+def concurrent_write(db):
+    """
+    Runs `sql` on the same connection just before the first write to
+    user_exercise_stats — as if another session had committed it
+    between a read and that write.
+    """
+    pending = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if pending and statement.startswith(
+            ("INSERT INTO user_exercise_stats", "UPDATE user_exercise_stats")
+        ):
+            cursor.connection.execute(pending.pop())
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before)
+    yield pending.append
+    event.remove(engine, "before_cursor_execute", before)
+
+
+def test_concurrent_first_save_of_a_day_is_not_lost(db, user, concurrent_write):
+    concurrent_write(
+        "INSERT INTO user_exercise_stats "
+        "(user_id, exercise_name, day, count, last_seen_at) "
+        f"VALUES ({user.id}, 'squat', date('now'), 1, datetime('now'))"
+    )
+
+    _store(db, user, "Squats 3x5")
+
+    assert [count for _, _, count in _stats(db, user)] == [2]
+
+
+def test_concurrent_save_during_a_delete_is_counted(db, user, concurrent_write):
+    workout = _store(db, user, "Squats 3x5")
+    _store(db, user, "Squats 5x5")
+
+    concurrent_write(
+        "UPDATE user_exercise_stats SET count = count + 1 "
+        f"WHERE user_id = {user.id}"
+    )
+    db.delete(workout)
+    db.commit()
+
+    assert [count for _, _, count in _stats(db, user)] == [2]
+
+
+def test_mysql_upsert_is_atomic():
+    sql = str(exercise_store._stat_upsert("mysql").compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE count = (user_exercise_stats.count + VALUES(count))" in sql
+    assert "greatest(" in sql
+
+
+def test_same_day_workouts_add_up(db, user):
+    _store(db, user, "Squats 3x5")
+    _store(db, user, "Squats 5x5")
+
+    assert [count for _, _, count in _stats(db, user)] == [2]
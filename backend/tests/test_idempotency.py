@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import idempotency
+import llm_gateway
+import models
+
+from conftest import WORKOUT_BODY
+
+ENDPOINT = "/workouts/generate"
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def achat_once(params):
+        calls.append(params)
+        choice = SimpleNamespace(
+            message=SimpleNamespace(content="Squats: 3 x 5", refusal=None),
+            finish_reason="stop",
+        )
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    monkeypatch.setattr(llm_gateway, "_achat_once", achat_once)
+    return calls
+
+
+def _naive(value):
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def test_claim_stamps_created_at_with_the_app_clock(db, user, monkeypatch):
+    stamp = datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(idempotency, "_now", lambda: stamp)
+
+    row_id, stored = idempotency.claim(db, user.id, ENDPOINT, "k1", "hash")
+
+    row = db.get(models.IdempotencyKey, row_id)
+    assert stored is None
+    assert _naive(row.created_at) == _naive(stamp)
+    assert _naive(row.locked_at) == _naive(stamp)
+
+
+def test_ttl_is_measured_on_the_same_clock(db, user, monkeypatch):
+    stamp = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(idempotency, "_now", lambda: stamp)
+    row_id, _ = idempotency.claim(db, user.id, ENDPOINT, "k2", "hash")
+    idempotency.complete(db, row_id, 200, {"id": 1})
+
+    monkeypatch.setattr(
+        idempotency, "_now", lambda: stamp + idempotency.IDEMPOTENCY_TTL - timedelta(minutes=1)
+    )
+    assert idempotency.claim(db, user.id, ENDPOINT, "k2", "hash")[1] == {
+        "status_code": 200, "content": {"id": 1},
+    }
+
+    monkeypatch.setattr(
+        idempotency, "_now", lambda: stamp + idempotency.IDEMPOTENCY_TTL + timedelta(minutes=1)
+    )
+    assert idempotency.claim(db, user.id, ENDPOINT, "k2", "hash") == (row_id, None)
+
+
+def test_retry_with_same_key_replays(client, db, auth_headers, upstream):
+    headers = {**auth_headers, "Idempotency-Key": "retry-1"}
+
+    first = client.post(ENDPOINT, json=WORKOUT_BODY, headers=headers)
+    second = client.post(ENDPOINT, json=WORKOUT_BODY, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json()["id"] == first.json()["id"]
+    assert len(upstream) == 1
+    assert db.query(models.Workout).count() == 1
+
+
+def test_same_key_different_body_is_422(client, auth_headers, upstream):
+    headers = {**auth_headers, "Idempotency-Key": "retry-2"}
+
+    client.post(ENDPOINT, json=WORKOUT_BODY, headers=headers)
+    other = client.post(ENDPOINT, json={**WORKOUT_BODY, "age": 31}, headers=headers)
+
+    assert other.status_code == 422
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import auth
+import llm_gateway
+import main
+import models
+from app.core.fake_llm import FAKE_PLAN
+from app.core.job_queue import (
+    FAILED,
+    SUCCEEDED,
+    JobQueue,
+    MemoryJobStore,
+    SHUTDOWN_ERROR,
+)
+
+from conftest import DIET_BODY, WORKOUT_BODY
+
+
+@pytest.fixture(autouse=True)
+def upstream(monkeypatch):
+    async def achat_once(params):
+        choice = SimpleNamespace(
+            message=SimpleNamespace(content=FAKE_PLAN, refusal=None),
+            finish_reason="stop",
+        )
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    monkeypatch.setattr(llm_gateway, "_achat_once", achat_once)
+
+
+def _wait_for_job(client, headers, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}", headers=headers).json()
+        if job["status"] in (SUCCEEDED, FAILED) or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+
+def test_async_workout_job_succeeds(client, db, auth_headers):
+    response = client.post(
+        "/workouts/generate?mode=async", json=WORKOUT_BODY, headers=auth_headers
+    )
+
+    assert response.status_code == 202
+    job = _wait_for_job(client, auth_headers, response.json()["job_id"])
+    assert job["status"] == SUCCEEDED
+    assert job["kind"] == "workout"
+    assert job["finished_at"]
+
+    workout = db.get(models.Workout, job["result"]["id"])
+    assert workout.workout_plan == job["result"]["workout_plan"] == FAKE_PLAN
+
+
+def test_async_diet_job_succeeds(client, db, auth_headers):
+    response = client.post(
+        "/diet/generate?mode=async", json=DIET_BODY, headers=auth_headers
+    )
+
+    job = _wait_for_job(client, auth_headers, response.json()["job_id"])
+    assert job["status"] == SUCCEEDED
+    assert db.get(models.Diet, job["result"]["id"]).diet_plan == FAKE_PLAN
+
+
+def test_failed_job_reports_its_error(client, auth_headers, monkeypatch):
+    async def broken(data):
+        raise RuntimeError("upstream went away")
+
+    monkeypatch.setattr(main, "agenerate_ai_workout", broken)
+
+    response = client.post(
+        "/workouts/generate?mode=async", json=WORKOUT_BODY, headers=auth_headers
+    )
+
+    job = _wait_for_job(client, auth_headers, response.json()["job_id"])
+    assert job["status"] == FAILED
+    assert job["error"] == "upstream went away"
+    assert job["result"] is None
+
+
+def test_job_is_private_to_its_user(client, db, auth_headers):
+    response = client.post(
+        "/workouts/generate?mode=async", json=WORKOUT_BODY, headers=auth_headers
+    )
+    job_id = response.json()["job_id"]
+
+    other = models.User(
+        email="other@example.com", password="x", first_name="O",
+        last_name="U", username="other",
+    )
+    db.add(other)
+    db.commit()
+    other_headers = {
+        "Authorization": f"Bearer {auth.create_access_token({'sub': other.email})}"
+    }
+
+    assert client.get(f"/jobs/{job_id}", headers=other_headers).status_code == 404
+    assert client.get("/jobs/missing", headers=auth_headers).status_code == 404
+
+
+def test_jobs_run_after_an_app_restart(app):
+    from database import SessionLocal, engine
+
+    headers = {
+        "Authorization": f"Bearer {auth.create_access_token({'sub': 'r@example.com'})}"
+    }
+
+    # Each TestClient startup is a fresh event loop, like --reload
+    try:
+        for restart in range(2):
+            with TestClient(app) as client:
+                if not restart:
+                    with SessionLocal() as db:
+                        db.add(models.User(
+                            email="r@example.com", password="x",
+                            first_name="R", last_name="U", username="r",
+                        ))
+                        db.commit()
+
+                response = client.post(
+                    "/workouts/generate?mode=async",
+                    json=WORKOUT_BODY,
+                    headers=headers,
+                )
+                job = _wait_for_job(client, headers, response.json()["job_id"])
+                assert job["status"] == SUCCEEDED
+    finally:
+        with engine.begin() as conn:
+            for table in reversed(models.Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+def test_stop_fails_running_and_queued_jobs():
+    queue = JobQueue(MemoryJobStore(), workers=1, maxsize=10)
+
+    async def forever():
+        await asyncio.sleep(60)
+
+    async def run():
+        queue.start()
+        running = queue.submit("workout", 1, forever)
+        queued = queue.submit("workout", 1, forever)
+        await asyncio.sleep(0.01)
+        await queue.stop()
+        return running["id"], queued["id"]
+
+    for job_id in asyncio.run(run()):
+        job = queue.get(job_id)
+        assert job["status"] == FAILED
+        assert job["error"] == SHUTDOWN_ERROR
+        assert job["finished_at"]
+    assert queue.stats()["running"] == 0
+
+
+def test_memory_store_evicts_finished_jobs():
+    store = MemoryJobStore(ttl=0, max_kept=100)
+    store.create({"id": "done", "status": "queued"})
+    store.update("done", status=SUCCEEDED)
+    store.create({"id": "waiting", "status": "queued"})
+
+    store.create({"id": "new", "status": "queued"})
+
+    assert store.get("done") is None
+    assert store.get("waiting") is not None
+
+
+def test_memory_store_is_capped():
+    store = MemoryJobStore(ttl=3600, max_kept=3)
+    for i in range(5):
+        store.create({"id": str(i), "status": "queued"})
+        store.update(str(i), status=SUCCEEDED)
+
+    assert [store.get(str(i)) is not None for i in range(5)] == [
+        False, False, True, True, True,
+    ]
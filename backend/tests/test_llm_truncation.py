@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import llm_gateway
+import models
+from app.core import metrics
+
+from conftest import WORKOUT_BODY
+
+
+def _response(text, finish_reason):
+    choice = SimpleNamespace(
+        message=SimpleNamespace(content=text, refusal=None),
+        finish_reason=finish_reason,
+    )
+    return SimpleNamespace(choices=[choice], usage=None)
+
+
+def _truncations(outcome):
+    return metrics.LLM_TRUNCATIONS.labels("m", "none", outcome)._value.get()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replays `finish_reasons` in order; records each call's max_tokens."""
+    state = SimpleNamespace(finish_reasons=[], caps=[])
+
+    def reply(params):
+        state.caps.append(params.get("max_tokens"))
+        return _response("Squats 3x5", state.finish_reasons.pop(0))
+
+    async def areply(params):
+        return reply(params)
+
+    monkeypatch.setattr(llm_gateway, "_chat_once", reply)
+    monkeypatch.setattr(llm_gateway, "_achat_once", areply)
+    return state
+
+
+PARAMS = {"model": "m", "messages": [{"role": "user", "content": "plan"}], "max_tokens": 100}
+
+
+def test_truncated_completion_is_retried_with_a_bigger_cap(upstream):
+    upstream.finish_reasons = ["length", "stop"]
+    before = _truncations("retried")
+
+    response = llm_gateway.chat(**PARAMS)
+
+    assert response.choices[0].finish_reason == "stop"
+    assert upstream.caps == [100, 200]
+    assert _truncations("retried") == before + 1
+
+
+def test_still_truncated_raises(upstream):
+    upstream.finish_reasons = ["length", "length"]
+    before = _truncations("failed")
+
+    with pytest.raises(llm_gateway.LLMTruncated):
+        llm_gateway.chat(**PARAMS)
+
+    assert _truncations("failed") == before + 1
+
+
+def test_retry_cap_is_bounded(upstream, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_COMPLETION_TOKENS", 100)
+    upstream.finish_reasons = ["length"]
+
+    with pytest.raises(llm_gateway.LLMTruncated):
+        llm_gateway.chat(**PARAMS)
+
+    assert upstream.caps == [100]
+
+
+def test_async_truncation_retry(upstream):
+    upstream.finish_reasons = ["length", "stop"]
+
+    response = asyncio.run(llm_gateway.achat(**PARAMS))
+
+    assert response.choices[0].finish_reason == "stop"
+    assert upstream.caps == [100, 200]
+
+
+def test_truncated_stream_raises_after_its_chunks(monkeypatch):
+    def chunk(text, finish_reason=None):
+        delta = SimpleNamespace(content=text)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)],
+            usage=None,
+        )
+
+    async def stream():
+        yield chunk("Squats ")
+        yield chunk("3x", finish_reason="length")
+
+    async def create(**params):
+        return stream()
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_gateway, "_client", lambda kind: client)
+    monkeypatch.setattr(llm_gateway, "_errors", lambda: ((), type("Never", (Exception,), {})))
+
+    async def consume():
+        chunks = []
+        with pytest.raises(llm_gateway.LLMTruncated):
+            async for text in llm_gateway.astream(**PARAMS):
+                chunks.append(text)
+        return chunks
+
+    assert asyncio.run(consume()) == ["Squats ", "3x"]
+
+
+def test_truncated_plan_is_502_and_not_stored(client, db, auth_headers, upstream):
+    upstream.finish_reasons = ["length", "length"]
+
+    response = client.post("/workouts/generate", json=WORKOUT_BODY, headers=auth_headers)
+
+    assert response.status_code == 502
+    assert db.query(models.Workout).count() == 0
@@ -0,0 +1,60 @@
+from sqlalchemy import text
+
+import models
+from app.core.pagination import keyset_page
+
+
+def _tied_workouts(db, user, count=3):
+    rows = [
+        models.Workout(user_id=user.id, name=f"w{i}", workout_plan="Squats 3x5")
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    # Same second, in the format the server-side now() default
+    # stores on SQLite (no microseconds)
+    db.execute(
+        text("UPDATE workouts SET created_at = '2026-01-01 12:00:00' WHERE user_id = :u"),
+        {"u": user.id},
+    )
+    db.commit()
+    db.expire_all()
+    return sorted((row.id for row in rows), reverse=True)
+
+
+def test_keyset_page_walks_equal_created_at(db, user):
+    ids = _tied_workouts(db, user)
+    query = db.query(models.Workout).filter(models.Workout.user_id == user.id)
+
+    first, cursor = keyset_page(query, models.Workout, 2)
+    second, last = keyset_page(query, models.Workout, 2, cursor)
+
+    assert [w.id for w in first] == ids[:2]
+    assert [w.id for w in second] == ids[2:]
+    assert last is None
+
+
+def test_memory_route_walks_equal_created_at(client, db, user, auth_headers):
+    ids = _tied_workouts(db, user)
+
+    seen, cursor = [], None
+    for _ in range(len(ids) + 1):
+        params = {"limit": 2, "view": "summary"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/workouts/memory", params=params, headers=auth_headers)
+        assert page.status_code == 200
+        seen += [item["id"] for item in page.json()["items"]]
+        cursor = page.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ids
+
+
+def test_invalid_cursor_is_400(client, auth_headers):
+    page = client.get(
+        "/workouts/memory", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+
+    assert page.status_code == 400
@@ -0,0 +1,33 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.core import responses
+from app.core.responses import ORJSONResponse
+
+CONTENT = {
+    "items": [
+        {
+            "id": 1,
+            "created_at": datetime(2026, 1, 2, 3, 4, 5),
+            "sent_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "day": date(2026, 1, 2),
+        }
+    ],
+    "next_cursor": None,
+}
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_renders_datetimes(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+
+    body = json.loads(ORJSONResponse(CONTENT).body)
+
+    item = body["items"][0]
+    assert item["created_at"] == "2026-01-02T03:04:05"
+    assert item["sent_at"] == "2026-01-02T03:04:05+00:00"
+    assert item["day"] == "2026-01-02"
+    assert body["next_cursor"] is None
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+
+import models
+import tips_prefetch
+from app.core import metrics
+from app.core.singleflight import SingleFlight
+from tips_prefetch import TipsPrefetcher
+
+
+class Upstream:
+    """A slow call that records whether it finished or was cancelled."""
+
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "tips"
+
+
+def test_concurrent_waiters_share_one_call():
+    flight, upstream = SingleFlight(), Upstream()
+
+    async def run():
+        return await asyncio.gather(*(flight.ado("k", upstream) for _ in range(3)))
+
+    assert asyncio.run(run()) == ["tips"] * 3
+    assert upstream.calls == 1
+    assert flight.stats() == {"upstream": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_cancelling_one_waiter_keeps_the_call_for_the_others():
+    flight, upstream = SingleFlight(), Upstream()
+
+    async def run():
+        leaving = asyncio.ensure_future(flight.ado("k", upstream))
+        staying = asyncio.ensure_future(flight.ado("k", upstream))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(run()) == "tips"
+    assert not upstream.cancelled
+
+
+def test_cancelling_the_last_waiter_cancels_the_call():
+    flight, upstream = SingleFlight(), Upstream(seconds=10)
+
+    async def run():
+        waiter = asyncio.ensure_future(flight.ado("k", upstream))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run's shutdown cancels leftovers
+        assert upstream.cancelled
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_sync_and_async_callers_share_one_call():
+    flight, upstream = SingleFlight(), Upstream(seconds=0.1)
+
+    def sync_call():
+        time.sleep(0.1)
+        upstream.calls += 1
+        return "tips"
+
+    async def run():
+        # Sync leader in a worker thread, async caller joins it
+        leader = asyncio.ensure_future(
+            asyncio.to_thread(flight.do, "k", sync_call)
+        )
+        await asyncio.sleep(0.02)
+        joined = await flight.ado("k", upstream)
+
+        # Async leader, sync caller (threadpool route) joins it
+        async_leader = asyncio.ensure_future(flight.ado("j", upstream))
+        await asyncio.sleep(0.02)
+        sync_joined = await asyncio.to_thread(flight.do, "j", sync_call)
+
+        return [await leader, joined, await async_leader, sync_joined]
+
+    assert asyncio.run(run()) == ["tips"] * 4
+    assert upstream.calls == 2
+    assert flight.stats() == {"upstream": 2, "coalesced": 2, "in_flight": 0}
+
+
+def test_sync_waiter_keeps_an_async_call_alive():
+    flight, upstream = SingleFlight(), Upstream(seconds=0.1)
+
+    async def run():
+        leaving = asyncio.ensure_future(flight.ado("k", upstream))
+        await asyncio.sleep(0.01)
+        staying = asyncio.ensure_future(
+            asyncio.to_thread(flight.do, "k", lambda: "unused")
+        )
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(run()) == "tips"
+    assert not upstream.cancelled
+
+
+def _run_prefetch(prefetcher, scenario):
+    async def run():
+        prefetcher.start()
+        try:
+            await scenario()
+        finally:
+            await prefetcher.stop()
+
+    asyncio.run(run())
+
+
+def test_prefetch_cancel_stops_the_upstream_call(monkeypatch):
+    flight, upstream = SingleFlight(), Upstream(seconds=10)
+
+    async def generate(plan):
+        await flight.ado(plan, upstream)
+
+    monkeypatch.setattr(tips_prefetch, "_generate_async", generate)
+    prefetcher = TipsPrefetcher(enabled=True)
+
+    async def scenario():
+        prefetcher.schedule(1, "Squats 3x5")
+        await asyncio.sleep(0.05)
+        prefetcher.cancel(1)
+        await asyncio.sleep(0.05)
+        assert upstream.cancelled
+        assert prefetcher.stats()["cancelled"] == 1
+
+    _run_prefetch(prefetcher, scenario)
+
+
+def test_cancelled_thread_prefetch_stores_nothing(db, monkeypatch):
+    import workout_tips
+
+    calls = []
+
+    def slow_generate(plan):
+        calls.append(plan)
+        time.sleep(0.2)
+        return {"warmup": ["w"], "workout": ["x"], "recovery": ["r"]}
+
+    monkeypatch.setattr(tips_prefetch, "ASYNC_DB_ENABLED", False)
+    monkeypatch.setattr(workout_tips, "generate_tips_from_plan", slow_generate)
+    plan = "Deadlift 5x3 (prefetch cancel test)"
+    prefetcher = TipsPrefetcher(enabled=True)
+
+    async def scenario():
+        prefetcher.schedule(3, plan)
+        await asyncio.sleep(0.05)
+        prefetcher.cancel(3)
+        # The thread cannot be interrupted; let it finish
+        await asyncio.sleep(0.3)
+
+    _run_prefetch(prefetcher, scenario)
+
+    key = workout_tips._tips_key(plan)
+    assert calls == [plan]
+    assert workout_tips._tips_lru.get(key) is None
+    assert db.query(models.WorkoutTipsCache).filter_by(cache_key=key).count() == 0
+
+
+def test_prefetch_failure_is_logged_and_counted(monkeypatch, caplog):
+    async def generate(plan):
+        raise RuntimeError("upstream exploded")
+
+    monkeypatch.setattr(tips_prefetch, "_generate_async", generate)
+    prefetcher = TipsPrefetcher(enabled=True)
+    before = metrics.BACKGROUND_FAILURES.labels("tips_prefetch")._value.get()
+
+    async def scenario():
+        prefetcher.schedule(7, "Squats 3x5")
+        await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.ERROR, logger="tips_prefetch"):
+        _run_prefetch(prefetcher, scenario)
+
+    assert prefetcher.stats()["failed"] == 1
+    assert "tips prefetch failed for workout 7" in caplog.text
+    assert metrics.BACKGROUND_FAILURES.labels("tips_prefetch")._value.get() == before + 1
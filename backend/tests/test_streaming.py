@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import models
+from app.core.fake_llm import FAKE_PLAN
+
+from conftest import DIET_BODY, WORKOUT_BODY
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_workout_stream_relays_chunks_and_persists(client, db, auth_headers):
+    response = client.post(
+        "/workouts/generate/stream", json=WORKOUT_BODY, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response.text)
+    deltas = [data["delta"] for event, data in events if event == "message"]
+    assert len(deltas) > 1
+    assert "".join(deltas).strip() == FAKE_PLAN
+
+    event, data = events[-1]
+    assert event == "done"
+
+    workout = db.get(models.Workout, data["id"])
+    assert workout.workout_plan == FAKE_PLAN
+    # Parsed once on insert, like the non-streaming route
+    assert workout.normalized_exercises
+
+
+def test_diet_stream_persists_diet(client, db, auth_headers):
+    response = client.post(
+        "/diet/generate/stream", json=DIET_BODY, headers=auth_headers
+    )
+
+    event, data = _events(response.text)[-1]
+    assert event == "done"
+    assert db.get(models.Diet, data["id"]).diet_plan == FAKE_PLAN
+
+
+def test_stream_error_is_reported_and_nothing_stored(
+    client, db, auth_headers, monkeypatch
+):
+    import openai_service
+
+    async def broken(messages, *args, **kwargs):
+        yield "Day 1"
+        raise RuntimeError("upstream went away")
+
+    monkeypatch.setattr(openai_service, "fake_stream_completion", broken)
+
+    response = client.post(
+        "/workouts/generate/stream", json=WORKOUT_BODY, headers=auth_headers
+    )
+
+    event, data = _events(response.text)[-1]
+    assert event == "error"
+    assert "upstream went away" in data["detail"]
+    assert db.query(models.Workout).count() == 0
+
+
+def test_stream_requires_auth(client):
+    response = client.post("/workouts/generate/stream", json=WORKOUT_BODY)
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [("/workouts/generate/stream", WORKOUT_BODY), ("/diet/generate/stream", DIET_BODY)],
+)
+def test_stream_holds_no_pooled_connection(
+    client, user, auth_headers, monkeypatch, path, body
+):
+    import auth
+    import openai_service
+    from database import engine
+
+    checked_out = []
+
+    async def stream(messages, *args, **kwargs):
+        checked_out.append(engine.pool.checkedout())
+        yield "Day 1"
+
+    monkeypatch.setattr(openai_service, "fake_stream_completion", stream)
+    # Uncached → get_current_user opens a session for the lookup
+    auth.invalidate_cached_user(user.email)
+
+    # The test's own session may hold one; the request adds none
+    before = engine.pool.checkedout()
+    response = client.post(path, json=body, headers=auth_headers)
+
+    assert _events(response.text)[-1][0] == "done"
+    assert checked_out == [before]
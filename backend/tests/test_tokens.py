@@ -0,0 +1,19 @@
+import sys
+
+import workout_tips
+from app.core import tokens
+
+
+def test_startup_preloads_the_tips_encoding(client):
+    # Loaded by lifespan, so no request pays for the BPE download
+    assert workout_tips.TIPS_MODEL in tokens._encodings
+
+
+def test_unavailable_encoding_falls_back_to_estimate(monkeypatch):
+    monkeypatch.setattr(tokens, "_encodings", {})
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+
+    tokens.preload_encodings("some-model")
+
+    assert tokens._encodings == {"some-model": None}
+    assert tokens.count_tokens("x" * 40, "some-model") == 10
@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.fake_llm import FAKE_PLAN
+from app.core.workout_normalizer import normalize_workout_plan
+
+from plan_corpus import EXPECTED, PLANS
+
+
+def _rows(plan: str):
+    return [
+        (e["name"], e["sets"], e["reps"], e["rest"], e["day"])
+        for e in normalize_workout_plan(plan)
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(PLANS))
+def test_corpus_plans(name):
+    assert _rows(PLANS[name]) == EXPECTED[name]
+
+
+def test_fake_plan():
+    rows = _rows(FAKE_PLAN)
+
+    assert len(rows) == 8
+    assert rows[0] == ("Push-Up", 3, "10-12", "60 sec", 1)
+    assert rows[-1] == ("Burpee", 3, "8", "90 sec", 3)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Side plank: 3 sets of 20 (10 each side)", ("Side Plank", 3, "20", None)),
+        ("3 sets of 15 squats", ("Squat", 3, "15", None)),
+        ("3 x 10 push-ups", ("Push-Up", 3, "10", None)),
+        ("Mountain climbers 3 rounds of 20", ("Mountain Climber", 3, "20", None)),
+        ("Jumping jacks: 4 rounds of 45 seconds", ("Jumping Jack", 4, "45 sec", None)),
+        ("Deadlift | Sets: 4 | Reps: 5", ("Deadlift", 4, "5", None)),
+        ("Step-ups 3 x 10 to 12, 60 sec rest", ("Step-Up", 3, "10-12", "60 sec")),
+    ],
+)
+def test_line_formats(line, expected):
+    rows = _rows(line)
+
+    assert [row[:4] for row in rows] == [expected]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "3 sets of 10 reps per leg",
+        "Rest 60 seconds between sets.",
+        "Warm-up: 5-10 minutes of light cardio",
+        "Drink 2 liters of water a day",
+    ],
+)
+def test_prose_is_skipped(line):
+    assert _rows(line) == []
+
+
+def test_weekday_headers_number_training_days_in_order():
+    plan = "Monday\nSquats 3x5\nThursday\nBench press 3x5\nSaturday\nDeadlift 1x5"
+
+    assert [row[4] for row in _rows(plan)] == [1, 2, 3]
+
+
+def test_weekday_after_numbered_days_does_not_collide():
+    plan = "Day 1: Push\nPush-ups 3x10\nDay 2: Pull\nPull-ups 3x5\nMonday: Legs\nSquats 3x8"
+
+    assert [row[4] for row in _rows(plan)] == [1, 2, 3]
+
+
+def test_empty_plan():
+    assert normalize_workout_plan("") == []
+    assert normalize_workout_plan(None) == []
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+import llm_gateway
+from database import ASYNC_DB_ENABLED, AsyncSessionLocal, SessionLocal
+from workout_tips import aget_or_generate_tips, get_or_generate_tips
+from app.core import metrics
+
+# ======================================================
+# 🔮 SPECULATIVE TIPS PRE-GENERATION
+# ======================================================
+# Users almost always open tips right after generating a
+# workout, so each new workout schedules its tips here; the
+# result lands in the tips cache and the first view is a hit.
+#
+# - Low priority: one worker, and a call only starts while the
+#   LLM limiter has headroom (TIPS_PREFETCH_MAX_LOAD of its
+#   concurrency / per-minute budgets). Otherwise it waits up to
+#   TIPS_PREFETCH_MAX_WAIT seconds, then is dropped.
+# - Bounded: a full queue drops new work instead of blocking.
+# - Deduplicated: same cache + single-flight path as the
+#   on-demand /workout-tips routes, so a user who opens tips
+#   mid-generation joins the in-flight call and finished tips
+#   are never generated twice.
+# - Cancellable: `cancel(workout_id)` (e.g. on delete); queued
+#   items are skipped, a running one is cancelled.
+#   - Async-DB mode: its upstream LLM call is cancelled with it
+#     unless an on-demand request is waiting on the same
+#     single-flight call (app/core/singleflight).
+#   - Sync-DB mode: the call runs in a worker thread and cannot be
+#     interrupted; it still completes (and is billed), but the
+#     result is not written to the tips cache.
+
+TIPS_PREFETCH = os.getenv("TIPS_PREFETCH", "1") == "1"
+TIPS_PREFETCH_QUEUE_SIZE = int(os.getenv("TIPS_PREFETCH_QUEUE_SIZE", 100))
+TIPS_PREFETCH_MAX_LOAD = float(os.getenv("TIPS_PREFETCH_MAX_LOAD", 0.5))
+TIPS_PREFETCH_MAX_WAIT = float(os.getenv("TIPS_PREFETCH_MAX_WAIT", 30))
+TIPS_PREFETCH_POLL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_sync(plan: str, abandoned: threading.Event) -> None:
+    db = SessionLocal()
+    try:
+        get_or_generate_tips(db, plan, abandoned=abandoned)
+    finally:
+        db.close()
+
+
+async def _generate_async(plan: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await aget_or_generate_tips(db, plan)
+
+
+class TipsPrefetcher:
+    def __init__(
+        self,
+        enabled: bool = TIPS_PREFETCH,
+        maxsize: int = TIPS_PREFETCH_QUEUE_SIZE,
+        max_load: float = TIPS_PREFETCH_MAX_LOAD,
+        max_wait: float = TIPS_PREFETCH_MAX_WAIT,
+    ):
+        self.enabled = enabled
+        self.maxsize = maxsize
+        self.max_load = max_load
+        self.max_wait = max_wait
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._pending: set = set()  # workout ids queued or running
+        self._cancelled: set = set()
+        self._current: Optional[int] = None
+        self._current_task: Optional[asyncio.Task] = None
+        # Tells a thread-run generation its result is unwanted
+        self._current_abandoned: Optional[threading.Event] = None
+
+        self.scheduled = 0
+        self.generated = 0
+        self.dropped = 0
+        self.skipped_busy = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    # =========================
+    # PRODUCERS
+    # =========================
+    def schedule(self, workout_id: int, plan: str) -> bool:
+        """
+        Queue tips for a freshly stored workout.
+        Must be called from the event loop; never blocks or raises.
+        """
+        if not self.enabled or self._queue is None or not plan:
+            return False
+
+        with self._lock:
+            if workout_id in self._pending:
+                return False
+            if self._queue.full():
+                self.dropped += 1
+                return False
+            self._pending.add(workout_id)
+            self._cancelled.discard(workout_id)
+            self.scheduled += 1
+
+        self._queue.put_nowait((workout_id, plan))
+        return True
+
+    def cancel(self, workout_id: int) -> None:
+        """
+        Drop queued/running work for `workout_id` (thread-safe).
+        """
+        with self._lock:
+            if workout_id not in self._pending:
+                return
+            self._cancelled.add(workout_id)
+            running = self._current == workout_id
+            task = self._current_task if running else None
+            if running:
+                self._current_abandoned.set()
+
+        if task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    # =========================
+    # WORKER
+    # =========================
+    async def _wait_for_headroom(self) -> bool:
+        waited = 0.0
+        while not llm_gateway.limiter.has_headroom(self.max_load):
+            if waited >= self.max_wait:
+                return False
+            await asyncio.sleep(TIPS_PREFETCH_POLL)
+            waited += TIPS_PREFETCH_POLL
+        return True
+
+    async def _prefetch(self, plan: str, abandoned: threading.Event) -> None:
+        if not await self._wait_for_headroom():
+            self.skipped_busy += 1
+            return
+
+        with metrics.endpoint_label("prefetch:tips"):
+            # Either way the same single-flight as /workout-tips
+            if ASYNC_DB_ENABLED:
+                await _generate_async(plan)
+            else:
+                await run_in_threadpool(_generate_sync, plan, abandoned)
+        self.generated += 1
+
+    async def _run(self) -> None:
+        while True:
+            workout_id, plan = await self._queue.get()
+
+            with self._lock:
+                skip = workout_id in self._cancelled
+                if not skip:
+                    self._current = workout_id
+                    self._current_abandoned = threading.Event()
+                    self._current_task = asyncio.create_task(
+                        self._prefetch(plan, self._current_abandoned)
+                    )
+                task = self._current_task
+
+            try:
+                if skip:
+                    self.cancelled += 1
+                else:
+                    await task
+            except asyncio.CancelledError:
+                if self._task is None or self._task.cancelled():
+                    raise  # shutting down
+                self.cancelled += 1
+            except Exception:
+                # Best effort: the on-demand route will retry for real
+                logger.exception("tips prefetch failed for workout %s", workout_id)
+                metrics.BACKGROUND_FAILURES.labels("tips_prefetch").inc()
+                self.failed += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(workout_id)
+                    self._cancelled.discard(workout_id)
+                    self._current = None
+                    self._current_task = None
+                    self._current_abandoned = None
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        with self._lock:
+            current = self._current_task
+            if self._current_abandoned is not None:
+                self._current_abandoned.set()
+        for t in (current, task):
+            if t is not None:
+                t.cancel()
+        await asyncio.gather(
+            *(t for t in (current, task) if t is not None),
+            return_exceptions=True,
+        )
+        self._queue = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "scheduled": self.scheduled,
+            "generated": self.generated,
+            "dropped": self.dropped,
+            "skipped_busy": self.skipped_busy,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "running": int(self._task is not None),
+        }
+
+
+tips_prefetcher = TipsPrefetcher()
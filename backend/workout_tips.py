@@ -1,15 +1,26 @@
 import os
 import json
+import threading
 from datetime import datetime
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from openai import OpenAI
 
+import llm_gateway
 from database import get_db
-from models import Workout
+from models import Workout, WorkoutTipsCache
 from auth import get_current_user
-from schemas import WorkoutTipsResponse
+from schemas import WorkoutTips, WorkoutTipsGenerateResponse
+from app.core import metrics
+from app.core.cache import LRUCache, content_hash
+from app.core.json_extract import extract_json_object
+from app.core.plan_summary import compact_plan
+from app.core.prompts import WORKOUT_TIPS
 
 # =========================
 # ROUTER
@@ -17,68 +28,241 @@ from schemas import WorkoutTipsResponse
 router = APIRouter(tags=["Workout Tips"])
 
 # =========================
-# OPENAI CLIENT
+# LLM SETTINGS
 # =========================
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+TIPS_MODEL = "gpt-4o-mini"
+TIPS_TEMPERATURE = 0.6
+
+# Token budgets: plan summary sent in, tips JSON out
+TIPS_INPUT_MAX_TOKENS = int(os.getenv("TIPS_INPUT_MAX_TOKENS", 400))
+TIPS_MAX_TOKENS = int(os.getenv("TIPS_MAX_TOKENS", 350))
+
+# Part of the tips cache key — bump WORKOUT_TIPS.version
+# (app/core/prompts.py) whenever the prompt changes,
+# otherwise stale cached tips keep being served.
+TIPS_PROMPT_VERSION = WORKOUT_TIPS.version
+
+# =========================
+# TIPS CACHE (LRU → DB → OpenAI)
+# =========================
+_tips_lru = LRUCache(maxsize=int(os.getenv("TIPS_CACHE_SIZE", 512)))
+
+
+def tips_cache_stats() -> dict:
+    return _tips_lru.stats()
 
 # ======================================================
 # 🔹 INTERNAL HELPER (REUSED — SAFE)
 # ======================================================
+def _tips_response_format() -> dict:
+    # Structured outputs: the reply is guaranteed to match the schema
+    schema = WorkoutTips.model_json_schema()
+    schema["additionalProperties"] = False
+
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "workout_tips", "strict": True, "schema": schema},
+    }
+
+
+TIPS_RESPONSE_FORMAT = _tips_response_format()
+
+
+def _tips_params(plan: str) -> dict:
+    return {
+        "model": TIPS_MODEL,
+        # Compact per-day exercise summary instead of the full plan prose
+        "messages": WORKOUT_TIPS.messages(
+            plan=compact_plan(plan, TIPS_INPUT_MAX_TOKENS, TIPS_MODEL)
+        ),
+        "temperature": TIPS_TEMPERATURE,
+        "max_tokens": TIPS_MAX_TOKENS,
+        "prompt_cache_key": WORKOUT_TIPS.id,
+        "response_format": TIPS_RESPONSE_FORMAT,
+    }
+
+
+def _load_tips(raw: str) -> tuple:
+    try:
+        return json.loads(raw), "json"
+    except json.JSONDecodeError:
+        # Fenced / chatty output (e.g. a model without structured outputs)
+        return extract_json_object(raw), "extracted"
+
+
+def _parse_tips(response) -> dict:
+    message = response.choices[0].message
+
+    try:
+        with metrics.time_stage("tips_parse"):
+            if getattr(message, "refusal", None):
+                raise ValueError(message.refusal)
+            data, result = _load_tips(message.content)
+            tips = WorkoutTips.model_validate(data).model_dump()
+    except (ValueError, ValidationError):
+        metrics.PARSES.labels("tips", "failed").inc()
+        metrics.PARSE_FAILURES.labels("tips").inc()
+        raise HTTPException(
+            status_code=500,
+            detail="AI response could not be parsed. Please try again."
+        )
+
+    metrics.PARSES.labels("tips", result).inc()
+    return tips
+
+
 def generate_tips_from_plan(plan: str) -> dict:
     """
     Generate structured workout tips from a workout plan.
     Shared by multiple endpoints.
     """
+    # Gateway: rate limits, retries, single-flight for double-clicks
+    return _parse_tips(llm_gateway.chat(**_tips_params(plan)))
+
+
+async def agenerate_tips_from_plan(plan: str) -> dict:
+    """
+    Async variant for the AsyncSession routes.
+    """
+    return _parse_tips(await llm_gateway.achat(**_tips_params(plan)))
+
+
+def _trim_tips(data: dict) -> dict:
+    return {
+        "warmup": data.get("warmup", [])[:3],
+        "workout": data.get("workout", [])[:3],
+        "recovery": data.get("recovery", [])[:3],
+    }
+
+
+def _tips_key(plan: str) -> str:
+    return content_hash(TIPS_PROMPT_VERSION, TIPS_MODEL, plan)
+
+
+def get_or_generate_tips(
+    db: Session,
+    plan: str,
+    regenerate: bool = False,
+    abandoned: Optional[threading.Event] = None,
+) -> dict:
+    """
+    Content-addressed tips lookup.
+
+    - Key: sha256(prompt version, model, plan text)
+    - In-process LRU first, then workout_tips_cache table
+    - OpenAI is only called on a miss or when regenerate=True
+    - `abandoned` set by the time OpenAI answers → nothing is stored
+      (a cancelled prefetch running in a thread)
+    """
+
+    key = _tips_key(plan)
+
+    if not regenerate:
+        cached = _tips_lru.get(key)
+        if cached is not None:
+            return cached
+
+        row = (
+            db.query(WorkoutTipsCache)
+            .filter(WorkoutTipsCache.cache_key == key)
+            .first()
+        )
+        if row:
+            _tips_lru.set(key, row.tips)
+            return row.tips
+
+    # Return the pooled connection while waiting on OpenAI;
+    # the session checks out a fresh one for the upsert below
+    db.close()
 
-    prompt = f"""
-You are an AI fitness coach.
-
-Generate workout tips in JSON ONLY.
-
-Rules:
-- Exactly 3 tips for warmup
-- Exactly 3 tips for workout
-- Exactly 3 tips for recovery
-- Each tip must be a short sentence
-- Use simple language
-- No emojis
-- No markdown
-- No headings
-- No extra text
-
-Output format:
-{{
-  "warmup": ["...", "...", "..."],
-  "workout": ["...", "...", "..."],
-  "recovery": ["...", "...", "..."]
-}}
-
-Workout plan:
-{plan}
-"""
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.6,
+    data = _trim_tips(generate_tips_from_plan(plan))
+
+    if abandoned is not None and abandoned.is_set():
+        return data
+
+    row = (
+        db.query(WorkoutTipsCache)
+        .filter(WorkoutTipsCache.cache_key == key)
+        .first()
     )
 
-    raw = response.choices[0].message.content
+    if row:
+        row.tips = data
+    else:
+        db.add(
+            WorkoutTipsCache(
+                cache_key=key,
+                model=TIPS_MODEL,
+                prompt_version=TIPS_PROMPT_VERSION,
+                tips=data,
+            )
+        )
 
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=500,
-            detail="AI response could not be parsed. Please try again."
+        db.commit()
+    except IntegrityError:
+        # Another request stored the same key first — keep ours in memory only
+        db.rollback()
+
+    _tips_lru.set(key, data)
+    return data
+
+
+async def aget_or_generate_tips(
+    db: AsyncSession,
+    plan: str,
+    regenerate: bool = False,
+) -> dict:
+    """
+    `get_or_generate_tips` over an AsyncSession.
+    """
+
+    key = _tips_key(plan)
+    stmt = select(WorkoutTipsCache).where(WorkoutTipsCache.cache_key == key)
+
+    if not regenerate:
+        cached = _tips_lru.get(key)
+        if cached is not None:
+            return cached
+
+        row = await db.scalar(stmt)
+        if row:
+            _tips_lru.set(key, row.tips)
+            return row.tips
+
+    # Same rule as the sync path: no pooled connection across OpenAI
+    await db.close()
+
+    data = _trim_tips(await agenerate_tips_from_plan(plan))
+
+    row = await db.scalar(stmt)
+
+    if row:
+        row.tips = data
+    else:
+        db.add(
+            WorkoutTipsCache(
+                cache_key=key,
+                model=TIPS_MODEL,
+                prompt_version=TIPS_PROMPT_VERSION,
+                tips=data,
+            )
         )
 
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+
+    _tips_lru.set(key, data)
+    return data
+
 # ======================================================
 # 1️⃣ GET LATEST WORKOUT TIPS (PRESERVED)
 # ======================================================
 @router.get(
     "/workout-tips",
-    response_model=WorkoutTipsResponse
+    response_model=WorkoutTipsGenerateResponse
 )
 def get_latest_workout_tips(
     regenerate: bool = Query(
@@ -106,12 +290,10 @@ def get_latest_workout_tips(
             detail="No workout found. Generate a workout first."
         )
 
-    data = generate_tips_from_plan(workout.workout_plan)
+    data = get_or_generate_tips(db, workout.workout_plan, regenerate)
 
-    return WorkoutTipsResponse(
-        warmup=data.get("warmup", [])[:3],
-        workout=data.get("workout", [])[:3],
-        recovery=data.get("recovery", [])[:3],
+    return WorkoutTipsGenerateResponse(
+        **data,
         created_at=datetime.utcnow(),
     )
 
@@ -120,10 +302,14 @@ def get_latest_workout_tips(
 # ======================================================
 @router.get(
     "/workout-tips/{workout_id}",
-    response_model=WorkoutTipsResponse
+    response_model=WorkoutTipsGenerateResponse
 )
 def get_workout_tips_by_workout_id(
     workout_id: int,
+    regenerate: bool = Query(
+        default=False,
+        description="Force regenerate tips using OpenAI"
+    ),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -147,11 +333,9 @@ def get_workout_tips_by_workout_id(
             detail="Workout not found"
         )
 
-    data = generate_tips_from_plan(workout.workout_plan)
+    data = get_or_generate_tips(db, workout.workout_plan, regenerate)
 
-    return WorkoutTipsResponse(
-        warmup=data.get("warmup", [])[:3],
-        workout=data.get("workout", [])[:3],
-        recovery=data.get("recovery", [])[:3],
+    return WorkoutTipsGenerateResponse(
+        **data,
         created_at=datetime.utcnow(),
     )